@@ -4,35 +4,59 @@ A3 Sectioned Document Automation System
 Uses manually defined sections for 100% consistent OCR and population
 """
 
+import itertools
 import os
+import re
 import time
 import json
 import shutil
+import subprocess
+import sys
 from pathlib import Path
 from tkinter import *
 from tkinter import ttk, filedialog, messagebox
 from tkinterdnd2 import TkinterDnD, DND_FILES
 import queue
 import threading
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Tuple
+import fitz  # PyMuPDF
 
 # Import the sectioned OCR system
-from sectioned_gpt4o_ocr import SectionedGPT4oOCR
+from sectioned_gpt4o_ocr import SectionedGPT4oOCR, FITZ_LOCK
 from a3_template_processor import A3TemplateProcessor
 
+# One KEY=value line of a .env file, optional matching quotes around the value
+# (only spaces/tabs are skipped, so an empty value never runs into the next line)
+ENV_LINE_PATTERN = re.compile(r"""^[ \t]*([A-Za-z_]\w*)[ \t]*=[ \t]*(["']?)(.*?)\2[ \t]*$""", re.M)
+
+def parse_env_text(text: str) -> List[Tuple[str, str]]:
+    """(key, value) pairs of a .env file's text, in file order."""
+    return [(key, value) for key, _, value in ENV_LINE_PATTERN.findall(text)]
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
     load_dotenv()
 except ImportError:
-    # Fallback: manually load .env file
+    # Fallback: manually load .env file (KEY=value lines, optional quotes; real env vars win)
     env_file = Path(".env")
     if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                if line.strip() and not line.startswith('#'):
-                    key, value = line.strip().split('=', 1)
-                    os.environ[key] = value
+        for key, value in parse_env_text(env_file.read_text(encoding="utf-8-sig")):
+            os.environ.setdefault(key, value)
+
+# Separator lines used in the results log
+SEPARATOR_80 = "=" * 80
+SEPARATOR_60 = "=" * 60
+SEPARATOR_50 = "=" * 50
+DIVIDER_50 = "-" * 50
+DIVIDER_40 = "-" * 40
+
+# Characters not allowed in generated output file names
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]")
+
+# Per-process sequence appended to output timestamps; files finishing in the same second no longer collide
+OUTPUT_SEQUENCE = itertools.count(1)
 
 class A3SectionedProcessor:
     """A3 document processor using manual section definitions."""
@@ -45,19 +69,30 @@ class A3SectionedProcessor:
         
         # Initialize sectioned OCR
         self.sectioned_ocr = SectionedGPT4oOCR(self.api_key, section_config_path, enable_spell_check)
+        self.sectioned_ocr.warm_up_connection()
         self.section_config_path = Path(section_config_path)
         
-        # Initialize template processor with custom config if available
-        custom_config_path = Path("A3_templates/custom_field_position.json")
-        if custom_config_path.exists():
-            print(f"✅ Found custom field configuration: {custom_config_path}")
-            custom_config = self._load_custom_config(custom_config_path)
-            self.template_processor = A3TemplateProcessor(custom_fields_config=custom_config)
-            self.using_custom_fields = True
-        else:
-            print("📝 Using default field configuration")
-            self.template_processor = A3TemplateProcessor()
-            self.using_custom_fields = False
+        # Template processor is only needed when no custom template PDF exists,
+        # so it is created on first use rather than at startup
+        self.custom_config_path = Path("A3_templates/custom_field_position.json")
+        self.using_custom_fields = self.custom_config_path.exists()
+        self._template_processor = None
+        
+        # Raw bytes of the custom template, reused across files until the file changes
+        self._template_cache = None  # (path, mtime_ns, bytes)
+    
+    @property
+    def template_processor(self) -> A3TemplateProcessor:
+        """Template processor using the custom field configuration if available (created lazily)."""
+        if self._template_processor is None:
+            if self.using_custom_fields:
+                print(f"✅ Found custom field configuration: {self.custom_config_path}")
+                custom_config = self._load_custom_config(self.custom_config_path)
+                self._template_processor = A3TemplateProcessor(custom_fields_config=custom_config)
+            else:
+                print("📝 Using default field configuration")
+                self._template_processor = A3TemplateProcessor()
+        return self._template_processor
     
     def _load_custom_config(self, config_path: Path) -> Dict:
         """Load custom field configuration from JSON file."""
@@ -118,9 +153,18 @@ class A3SectionedProcessor:
             print(f"⚠️ Error regenerating template: {e}")
             print("⚠️ Proceeding with existing template")
     
+    def _load_template_bytes(self, template_path: Path) -> bytes:
+        """Return the template PDF bytes, re-reading the file only when it has changed."""
+        mtime_ns = template_path.stat().st_mtime_ns
+        if self._template_cache and self._template_cache[:2] == (template_path, mtime_ns):
+            return self._template_cache[2]
+        
+        template_bytes = template_path.read_bytes()
+        self._template_cache = (template_path, mtime_ns, template_bytes)
+        return template_bytes
+    
     def populate_template_directly(self, template_path: Path, output_path: Path, field_mappings: Dict[str, str]) -> Path:
         """Directly populate template fields using sectioned field mappings."""
-        import fitz  # PyMuPDF
         
         print(f"📝 DIRECT TEMPLATE POPULATION")
         print(f"   📄 Template: {template_path}")
@@ -130,8 +174,8 @@ class A3SectionedProcessor:
         # Ensure output directory exists
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Open template PDF
-        pdf_doc = fitz.open(template_path)
+        # Open template PDF from the cached bytes (each file gets a fresh in-memory copy)
+        pdf_doc = fitz.open("pdf", self._load_template_bytes(template_path))
         
         populated_fields = 0
         total_fields = 0
@@ -242,7 +286,9 @@ class A3SectionedProcessor:
                 raise Exception(f"Section configuration not found: {self.section_config_path}. Create sections using section_definition_tool.py")
             
             # Ensure custom template is up-to-date with latest field positions
-            self._ensure_template_updated()
+            # (under the fitz lock so concurrent files never see a half-written template)
+            with FITZ_LOCK:
+                self._ensure_template_updated()
             
             print(f"🎯 Processing with SECTIONED OCR: {file_path}")
             
@@ -265,10 +311,10 @@ class A3SectionedProcessor:
             # Create populated PDF template using direct field mapping
             if standard_results:
                 try:
-                    # Generate output filename with timestamp
+                    # Generate output filename with timestamp and sequence number
                     timestamp = int(time.time())
-                    safe_filename = "".join(c for c in file_path.stem if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    output_filename = f"A3_Sectioned_{safe_filename}_{timestamp}.pdf"
+                    safe_filename = UNSAFE_FILENAME_CHARS.sub("", file_path.stem).rstrip()
+                    output_filename = f"A3_Sectioned_{safe_filename}_{timestamp}_{next(OUTPUT_SEQUENCE)}.pdf"
                     output_path = Path("processed_documents") / output_filename
                     
                     # Extract direct field mappings from all pages
@@ -288,14 +334,16 @@ class A3SectionedProcessor:
                         print(f"🎯 Using your custom template: {custom_template_path}")
                         
                         # Use direct field mapping approach
-                        final_pdf_path = self.populate_template_directly(
-                            custom_template_path,
-                            output_path,
-                            all_field_mappings
-                        )
+                        with FITZ_LOCK:
+                            final_pdf_path = self.populate_template_directly(
+                                custom_template_path,
+                                output_path,
+                                all_field_mappings
+                            )
                     else:
                         print(f"📝 Custom template not found, using standard approach")
-                        final_pdf_path = self.template_processor.populate_template(standard_results, output_path)
+                        with FITZ_LOCK:
+                            final_pdf_path = self.template_processor.populate_template(standard_results, output_path)
                     
                     processing_info['output_pdf_path'] = final_pdf_path
                     
@@ -312,6 +360,15 @@ class A3SectionedProcessor:
 class A3SectionedAutomationUI:
     """UI for sectioned A3 document automation."""
     
+    # Number of dropped files processed at the same time (each is mostly waiting on the API)
+    MAX_CONCURRENT_FILES = 4
+    
+    # How often the status queue is drained while processing (milliseconds)
+    STATUS_POLL_INTERVAL_MS = 200
+    
+    # Oldest log output is dropped once the results display grows past this
+    MAX_LOG_CHARS = 100000
+    
     def __init__(self):
         self.root = TkinterDnD.Tk()
         self.root.title("A3 Sectioned Automation - Manual Section Control")
@@ -320,6 +377,7 @@ class A3SectionedAutomationUI:
         
         # Status queue for thread communication
         self.status_queue = queue.Queue()
+        self._monitoring_status = False
         
         # Initialize processor
         self.processor = None
@@ -573,8 +631,6 @@ class A3SectionedAutomationUI:
     
     def launch_section_tool(self):
         """Launch the section definition tool."""
-        import subprocess
-        import sys
         
         try:
             subprocess.Popen([sys.executable, "section_definition_tool.py"])
@@ -585,8 +641,6 @@ class A3SectionedAutomationUI:
     
     def launch_field_tool(self):
         """Launch the field positioning tool for editing output template fields."""
-        import subprocess
-        import sys
         
         try:
             subprocess.Popen([sys.executable, "field_positioning_tool.py"])
@@ -598,8 +652,6 @@ class A3SectionedAutomationUI:
     
     def launch_flatten_tool(self):
         """Launch the PDF flattening tool for removing editable fields."""
-        import subprocess
-        import sys
         
         try:
             subprocess.Popen([sys.executable, "pdf_flattening_tool.py"])
@@ -717,8 +769,10 @@ class A3SectionedAutomationUI:
         )
         thread.start()
         
-        # Start monitoring the status queue
-        self.monitor_status_queue()
+        # Start monitoring the status queue (once - later runs reuse the same polling loop)
+        if not self._monitoring_status:
+            self._monitoring_status = True
+            self.monitor_status_queue()
     
     def _process_files_background(self, file_paths: List[Path]):
         """Process files in background thread using sectioned OCR."""
@@ -731,77 +785,112 @@ class A3SectionedAutomationUI:
             total_sections = 0
             sections_with_text = 0
             created_pdfs = []
+            # Log lines are buffered and sent to the UI one block at a time
+            messages = []
             
-            for i, file_path in enumerate(file_paths, 1):
-                self.status_queue.put(("message", f"\n{'='*60}"))
-                self.status_queue.put(("message", f"PROCESSING FILE {i}/{len(file_paths)}: {file_path.name}"))
-                self.status_queue.put(("message", f"{'='*60}"))
-                
-                # Process using sectioned OCR
-                processing_info = self.processor.process_file(file_path)
+            # Files run concurrently; each one's log is sent as a block when it finishes
+            with ThreadPoolExecutor(max_workers=max(1, min(self.MAX_CONCURRENT_FILES, len(file_paths)))) as executor:
+                futures = [
+                    executor.submit(self._process_single_file, i, len(file_paths), file_path)
+                    for i, file_path in enumerate(file_paths, 1)
+                ]
                 
-                if processing_info.get('success', False):
-                    successful_files += 1
-                    total_sections += processing_info.get('sections_processed', 0)
-                    sections_with_text += processing_info.get('sections_with_text', 0)
+                # Totals are only updated here, in the collecting thread
+                for future in as_completed(futures):
+                    processing_info, file_messages = future.result()
                     
-                    # Show detailed sectioned results
-                    self._display_sectioned_results(processing_info)
-                    
-                    # Show template creation results
-                    output_pdf = processing_info.get('output_pdf_path')
-                    if output_pdf:
-                        created_pdfs.append(output_pdf)
-                        self.status_queue.put(("message", f"\n🎉 SECTIONED A3 DOCUMENT CREATED"))
-                        self.status_queue.put(("message", f"{'='*50}"))
-                        self.status_queue.put(("message", f"✅ 100% Consistent sectioned OCR completed"))
-                        self.status_queue.put(("message", f"📁 Output: {output_pdf.name}"))
-                        self.status_queue.put(("message", f"🎯 Manual sections → Perfect field mapping"))
-                        self.status_queue.put(("message", f"⏱️ Processing time: {processing_info.get('total_processing_time', 0):.2f}s"))
+                    if processing_info.get('success', False):
+                        successful_files += 1
+                        total_sections += processing_info.get('sections_processed', 0)
+                        sections_with_text += processing_info.get('sections_with_text', 0)
+                        
+                        output_pdf = processing_info.get('output_pdf_path')
+                        if output_pdf:
+                            created_pdfs.append(output_pdf)
                     
-                    if processing_info.get('error'):
-                        self.status_queue.put(("message", f"⚠️ Template warning: {processing_info['error']}"))
-                
-                else:
-                    error = processing_info.get('error', 'Unknown error')
-                    self.status_queue.put(("message", f"❌ Error processing {file_path.name}: {error}"))
+                    self._flush_messages(file_messages)
             
             # Final summary
             total_time = time.time() - total_start_time
-            self.status_queue.put(("message", f"\n{'='*80}"))
-            self.status_queue.put(("message", "🎉 SECTIONED A3 AUTOMATION COMPLETE"))
-            self.status_queue.put(("message", f"{'='*80}"))
-            self.status_queue.put(("message", f"📊 Files processed: {successful_files}/{len(file_paths)}"))
-            self.status_queue.put(("message", f"🎯 Total sections processed: {total_sections}"))
-            self.status_queue.put(("message", f"📝 Sections with text: {sections_with_text}"))
-            self.status_queue.put(("message", f"📄 Completed documents: {len(created_pdfs)}"))
+            messages.append(f"\n{SEPARATOR_80}")
+            messages.append("🎉 SECTIONED A3 AUTOMATION COMPLETE")
+            messages.append(SEPARATOR_80)
+            messages.append(f"📊 Files processed: {successful_files}/{len(file_paths)}")
+            messages.append(f"🎯 Total sections processed: {total_sections}")
+            messages.append(f"📝 Sections with text: {sections_with_text}")
+            messages.append(f"📄 Completed documents: {len(created_pdfs)}")
             
             if created_pdfs:
-                self.status_queue.put(("message", f"\n📁 COMPLETED DOCUMENTS:"))
+                messages.append(f"\n📁 COMPLETED DOCUMENTS:")
                 for pdf_path in created_pdfs:
-                    self.status_queue.put(("message", f"   ✅ {pdf_path}"))
+                    messages.append(f"   ✅ {pdf_path}")
             
-            self.status_queue.put(("message", f"\n🎯 SECTIONED OCR ADVANTAGES:"))
-            self.status_queue.put(("message", f"   ✅ 100% consistent section detection"))
-            self.status_queue.put(("message", f"   ✅ No variable GPT-4o sectioning"))
-            self.status_queue.put(("message", f"   ✅ Perfect text-to-field mapping"))
-            self.status_queue.put(("message", f"   ✅ Manual control over OCR areas"))
+            messages.append(f"\n🎯 SECTIONED OCR ADVANTAGES:")
+            messages.append(f"   ✅ 100% consistent section detection")
+            messages.append(f"   ✅ No variable GPT-4o sectioning")
+            messages.append(f"   ✅ Perfect text-to-field mapping")
+            messages.append(f"   ✅ Manual control over OCR areas")
             
-            self.status_queue.put(("message", f"\n⏱️ Total time: {total_time:.2f}s"))
+            messages.append(f"\n⏱️ Total time: {total_time:.2f}s")
+            self._flush_messages(messages)
             self.status_queue.put(("status", "🎉 Sectioned processing complete!"))
             
         except Exception as e:
             self.status_queue.put(("error", f"❌ Processing failed: {e}"))
     
-    def _display_sectioned_results(self, processing_info: Dict[str, Any]):
-        """Display results from sectioned processing with direct field mappings."""
-        self.status_queue.put(("message", f"\n🎯 SECTIONED OCR RESULTS"))
-        self.status_queue.put(("message", f"{'='*50}"))
-        self.status_queue.put(("message", f"📊 Approach: Manual sectioning with direct field mapping"))
-        self.status_queue.put(("message", f"📄 Pages: {processing_info.get('pages_processed', 0)}"))
-        self.status_queue.put(("message", f"🎯 Sections processed: {processing_info.get('sections_processed', 0)}"))
-        self.status_queue.put(("message", f"📝 Sections with text: {processing_info.get('sections_with_text', 0)}"))
-        self.status_queue.put(("message", f"⏱️ Processing time: {processing_info.get('total_processing_time', 0):.2f}s"))
+    def _process_single_file(self, index: int, total: int, file_path: Path):
+        """Process one file in a worker thread; returns its info and buffered log lines."""
+        self.status_queue.put(("status", f"🎯 Processing {file_path.name} ({index}/{total})..."))
+        
+        messages = []
+        messages.append(f"\n{SEPARATOR_60}")
+        messages.append(f"PROCESSING FILE {index}/{total}: {file_path.name}")
+        messages.append(SEPARATOR_60)
+        
+        try:
+            # Process using sectioned OCR
+            processing_info = self.processor.process_file(file_path)
+        except Exception as e:
+            processing_info = {'success': False, 'error': str(e)}
+        
+        if processing_info.get('success', False):
+            # Show detailed sectioned results
+            self._display_sectioned_results(processing_info, messages)
+            
+            # Show template creation results
+            output_pdf = processing_info.get('output_pdf_path')
+            if output_pdf:
+                messages.append(f"\n🎉 SECTIONED A3 DOCUMENT CREATED")
+                messages.append(SEPARATOR_50)
+                messages.append(f"✅ 100% Consistent sectioned OCR completed")
+                messages.append(f"📁 Output: {output_pdf.name}")
+                messages.append(f"🎯 Manual sections → Perfect field mapping")
+                messages.append(f"⏱️ Processing time: {processing_info.get('total_processing_time', 0):.2f}s")
+            
+            if processing_info.get('error'):
+                messages.append(f"⚠️ Template warning: {processing_info['error']}")
+        
+        else:
+            error = processing_info.get('error', 'Unknown error')
+            messages.append(f"❌ Error processing {file_path.name}: {error}")
+        
+        return processing_info, messages
+    
+    def _flush_messages(self, messages: List[str]):
+        """Send buffered log lines to the UI as a single queue message."""
+        if messages:
+            self.status_queue.put(("message", "\n".join(messages)))
+            messages.clear()
+    
+    def _display_sectioned_results(self, processing_info: Dict[str, Any], messages: List[str]):
+        """Buffer results from sectioned processing with direct field mappings."""
+        messages.append(f"\n🎯 SECTIONED OCR RESULTS")
+        messages.append(SEPARATOR_50)
+        messages.append(f"📊 Approach: Manual sectioning with direct field mapping")
+        messages.append(f"📄 Pages: {processing_info.get('pages_processed', 0)}")
+        messages.append(f"🎯 Sections processed: {processing_info.get('sections_processed', 0)}")
+        messages.append(f"📝 Sections with text: {processing_info.get('sections_with_text', 0)}")
+        messages.append(f"⏱️ Processing time: {processing_info.get('total_processing_time', 0):.2f}s")
         
         # Show direct field mappings summary
         page_results = processing_info.get('page_results', [])
@@ -811,11 +900,11 @@ class A3SectionedAutomationUI:
                 all_mappings.update(result["direct_field_mapping"])
         
         if all_mappings:
-            self.status_queue.put(("message", f"\n🎯 DIRECT FIELD MAPPINGS ({len(all_mappings)} fields):"))
-            self.status_queue.put(("message", f"{'-'*50}"))
+            messages.append(f"\n🎯 DIRECT FIELD MAPPINGS ({len(all_mappings)} fields):")
+            messages.append(DIVIDER_50)
             for field_name, text in all_mappings.items():
                 display_text = text[:60] + "..." if len(text) > 60 else text
-                self.status_queue.put(("message", f"✅ {field_name}: '{display_text}'"))
+                messages.append(f"✅ {field_name}: '{display_text}'")
         
         # Show detailed page results
         for result in page_results:
@@ -823,8 +912,8 @@ class A3SectionedAutomationUI:
                 page_num = result.get('page_number', 1)
                 sections = result.get('sections', [])
                 
-                self.status_queue.put(("message", f"\n📄 PAGE {page_num} SECTIONS:"))
-                self.status_queue.put(("message", f"{'-'*40}"))
+                messages.append(f"\n📄 PAGE {page_num} SECTIONS:")
+                messages.append(DIVIDER_40)
                 
                 for section in sections:
                     section_name = section.get('location', 'Unknown section')  # location contains section name
@@ -842,24 +931,33 @@ class A3SectionedAutomationUI:
                         status_icon = "❌"
                         field_info = " → (no field mapping)"
                     
-                    self.status_queue.put(("message", f"{status_icon} {section_name}{field_info}"))
+                    messages.append(f"{status_icon} {section_name}{field_info}")
                     
                     if text:
                         display_text = text[:80] + "..." if len(text) > 80 else text
-                        self.status_queue.put(("message", f"   📝 Text: {display_text}"))
+                        messages.append(f"   📝 Text: {display_text}")
                     else:
-                        self.status_queue.put(("message", f"   ⚪ (no text extracted)"))
+                        messages.append(f"   ⚪ (no text extracted)")
     
     def monitor_status_queue(self):
         """Monitor the status queue for updates."""
+        # Drain everything queued since the last tick and write log output in one insert
+        pending_messages = []
         try:
             while True:
                 msg_type, message = self.status_queue.get_nowait()
                 
+                if msg_type == "message":
+                    pending_messages.append(message)
+                    continue
+                
+                # Flush buffered log output first so ordering is preserved
+                if pending_messages:
+                    self.log_message("\n".join(pending_messages))
+                    pending_messages.clear()
+                
                 if msg_type == "status":
                     self.status_bar.config(text=message)
-                elif msg_type == "message":
-                    self.log_message(message)
                 elif msg_type == "clear":
                     self.clear_results()
                 elif msg_type == "error":
@@ -869,13 +967,20 @@ class A3SectionedAutomationUI:
         except queue.Empty:
             pass
         
+        if pending_messages:
+            self.log_message("\n".join(pending_messages))
+        
         # Schedule next check
-        self.root.after(100, self.monitor_status_queue)
+        self.root.after(self.STATUS_POLL_INTERVAL_MS, self.monitor_status_queue)
     
     def log_message(self, message: str):
         """Add message to results display."""
         self.results_text.config(state=NORMAL)
         self.results_text.insert(END, message + "\n")
+        
+        # Keep the display bounded during long batch runs
+        self.results_text.delete(1.0, f"end-{self.MAX_LOG_CHARS}c")
+        
         self.results_text.see(END)
         self.results_text.config(state=DISABLED)
     
@@ -4,516 +4,763 @@ A3 Template Processor
 Creates interactive PDF templates with form fields and populates them with extracted text
 """
 
+import copy
+import functools
+import hashlib
+import logging
 import fitz  # PyMuPDF
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Tuple
 import json
+import re
 import time
+import uuid
+
+# Optional faster JSON parsing/serialization for field configuration files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def _keyword_pattern(keywords: List[str]) -> re.Pattern:
+    """Compile a keyword list into one alternation (same result as any(k in text))."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+# Page 1 content rules, checked in order: text matching the pattern goes to the first
+# field whose name contains all of the listed keywords
+PAGE1_CONTENT_RULES = [
+    (_keyword_pattern(['danger', 'eliminate', 'risk', 'threat', 'avoid', 'prevent']), ('danger', 'eliminate')),
+    (_keyword_pattern(['opportunit', 'focus', 'capture', 'chance', 'potential']), ('opportunit', 'focus')),
+    (_keyword_pattern(['strength', 'reinforce', 'maximi', 'strong', 'advantage']), ('strength', 'reinforce')),
+]
+
+# Checked after the position rules on page 1
+PAGE1_BRANDING_RULE = (_keyword_pattern(['more4life', 'm4lfs', 'brookvale', 'dale street']), ('more4life',))
+
+# Page 1 right-side locations and the field for each vertical position
+PAGE1_RIGHT_SIDE_PATTERN = _keyword_pattern(['right', 'center right', 'middle right'])
+PAGE1_RIGHT_SIDE_ROW_RULES = [
+    (_keyword_pattern(['top', 'upper', 'high']), 'right_mid'),
+    (_keyword_pattern(['middle', 'center', 'mid']), 'right_belowmid'),
+    (_keyword_pattern(['bottom', 'lower', 'down']), 'right_bottom'),
+]
+
+# Page 2 category (column) keywords, checked in order against the section text
+PAGE2_CATEGORY_RULES = [
+    (_keyword_pattern(['money', 'financial', 'finance', '$', 'dollar', 'cash', 'income', 'salary']), 'money'),
+    (_keyword_pattern(['business', 'work', 'career', 'job', 'company', 'office']), 'business'),
+    (_keyword_pattern(['leisure', 'hobby', 'fun', 'vacation', 'travel', 'entertainment']), 'leisure'),
+    (_keyword_pattern(['health', 'fitness', 'medical', 'doctor', 'exercise', 'diet']), 'health'),
+    (_keyword_pattern(['family', 'child', 'kids', 'spouse', 'parent', 'home']), 'family'),
+]
+
+# Every category keyword in one alternation: a single scan rules out text with no category at all
+PAGE2_ANY_CATEGORY_PATTERN = re.compile("|".join(pattern.pattern for pattern, _ in PAGE2_CATEGORY_RULES))
+
+# Page 2 field type (row) keywords in the section text, then in its location
+PAGE2_FIELD_TYPE_RULES = [
+    (_keyword_pattern(['goal', 'want', 'wish', 'dream', 'aim', 'target']), 'goals'),
+    (_keyword_pattern(['now', 'current', 'today', 'present', 'doing']), 'now'),
+    (_keyword_pattern(['todo', 'to do', 'action', 'plan', 'next', 'will']), 'todo'),
+]
+PAGE2_POSITION_FIELD_TYPE_RULES = [
+    (_keyword_pattern(['top', 'upper', 'first']), 'goals'),
+    (_keyword_pattern(['middle', 'center']), 'now'),
+    (_keyword_pattern(['bottom', 'lower', 'last']), 'todo'),
+]
+
+# 🎯 MANUAL POSITION TO FIELD MAPPING (User-defined)
+# Order matters! Most specific patterns first: the table is sorted by descending key length
+# below (stable, so equal lengths keep this order) and the first contained key wins
+PAGE2_MANUAL_POSITION_MAPPING = tuple(sorted([
+    # Row 2 (GOALS) - Most specific first (handle both hyphen variants)
+    ("second row center-right", "health_goals"),  # With hyphen
+    ("second row center right", "health_goals"),  # Without hyphen  
+    ("second row center-left", "business_goals"),
+    ("second row center", "leisure_goals"),
+    ("second row left", "money_goals"),
+    ("second row right", "family_goals"),
+    
+    # Row 3 (NOW) - Most specific first (handle both hyphen variants)
+    ("third row center-right", "health_now"),
+    ("third row center right", "health_now"),
+    ("third row center-left", "business_now"),
+    ("third row center left", "business_now"),
+    ("third row center", "leisure_now"),
+    ("third row left", "money_now"),
+    ("third row right", "family_now"),
+    
+    # Row 4 (TO DO) - Most specific first (handle both hyphen variants)
+    ("fourth row center-right", "health_todo"),
+    ("fourth row center right", "health_todo"),
+    ("fourth row center-left", "business_todo"),
+    ("fourth row center left", "business_todo"),
+    ("fourth row center", "leisure_todo"),
+    ("fourth row left", "money_todo"),
+    ("fourth row right", "family_todo")
+], key=lambda mapping: -len(mapping[0])))
+
+# Any manual position key in one alternation: a single scan rules out locations with none of them
+PAGE2_MANUAL_POSITION_PATTERN = _keyword_pattern([position_key for position_key, _ in PAGE2_MANUAL_POSITION_MAPPING])
+
+# Page 2 position fallback: column (category) from the location, then the row within it
+PAGE2_COLUMN_RULES = [
+    (_keyword_pattern(['left', 'first column']), 'money'),
+    (_keyword_pattern(['center left', 'second column']), 'business'),
+    (_keyword_pattern(['center', 'middle column', 'third column']), 'leisure'),
+    (_keyword_pattern(['center right', 'fourth column']), 'health'),
+    (_keyword_pattern(['right', 'last column', 'fifth column']), 'family'),
+]
+PAGE2_COLUMN_ROW_RULES = [
+    (_keyword_pattern(['top', 'upper']), 'goals'),
+    (_keyword_pattern(['middle', 'center']), 'now'),
+    (_keyword_pattern(['bottom', 'lower']), 'todo'),
+]
+
+def _first_rule_match(rules: List[Tuple[re.Pattern, str]], text: str) -> str:
+    """Value of the first (pattern, value) rule whose pattern occurs in text, else None."""
+    for pattern, value in rules:
+        if pattern.search(text):
+            return value
+    return None
+
+# Where form fields are placed on each page by default. Shared by all processors: treat as read-only
+DEFAULT_FORM_FIELDS_CONFIG = {
+    "page_1": [
+        # Circle content areas (left side)
+        {"name": "dangers_content", "rect": [50, 200, 280, 300], "type": "text", "multiline": True},
+        {"name": "opportunities_content", "rect": [50, 350, 280, 450], "type": "text", "multiline": True},
+        {"name": "strengths_content", "rect": [50, 500, 280, 600], "type": "text", "multiline": True},
+    
+        # Right side content areas
+        {"name": "financial_info", "rect": [320, 200, 550, 300], "type": "text", "multiline": True},
+        {"name": "career_plans", "rect": [320, 350, 550, 450], "type": "text", "multiline": True},
+        {"name": "additional_notes", "rect": [320, 500, 550, 600], "type": "text", "multiline": True},
+    ],
+    "page_2": [
+        # Money column
+        {"name": "money_goals", "rect": [50, 150, 160, 250], "type": "text", "multiline": True},
+        {"name": "money_now", "rect": [50, 300, 160, 400], "type": "text", "multiline": True},
+        {"name": "money_todo", "rect": [50, 450, 160, 550], "type": "text", "multiline": True},
+    
+        # Business column
+        {"name": "business_goals", "rect": [170, 150, 280, 250], "type": "text", "multiline": True},
+        {"name": "business_now", "rect": [170, 300, 280, 400], "type": "text", "multiline": True},
+        {"name": "business_todo", "rect": [170, 450, 280, 550], "type": "text", "multiline": True},
+    
+        # Leisure column
+        {"name": "leisure_goals", "rect": [290, 150, 400, 250], "type": "text", "multiline": True},
+        {"name": "leisure_now", "rect": [290, 300, 400, 400], "type": "text", "multiline": True},
+        {"name": "leisure_todo", "rect": [290, 450, 400, 550], "type": "text", "multiline": True},
+    
+        # Health column
+        {"name": "health_goals", "rect": [410, 150, 520, 250], "type": "text", "multiline": True},
+        {"name": "health_now", "rect": [410, 300, 520, 400], "type": "text", "multiline": True},
+        {"name": "health_todo", "rect": [410, 450, 520, 550], "type": "text", "multiline": True},
+    
+        # Family column
+        {"name": "family_goals", "rect": [530, 150, 640, 250], "type": "text", "multiline": True},
+        {"name": "family_now", "rect": [530, 300, 640, 400], "type": "text", "multiline": True},
+        {"name": "family_todo", "rect": [530, 450, 640, 550], "type": "text", "multiline": True},
+    ]
+}
+
+# Serialized "blank template + form fields" PDFs shared by all processors in the process,
+# keyed by template file, its mtime and a hash of the field config (least recently used first)
+TEMPLATE_BYTES_CACHE_SIZE = 8
+_template_bytes_cache = OrderedDict()
+
+def _get_template_bytes(cache_key: Tuple[str, int, str]) -> bytes:
+    """Cached template bytes for cache_key, or None."""
+    template_bytes = _template_bytes_cache.get(cache_key)
+    if template_bytes is not None:
+        _template_bytes_cache.move_to_end(cache_key)
+    return template_bytes
+
+def _put_template_bytes(cache_key: Tuple[str, int, str], template_bytes: bytes):
+    """Cache template bytes, dropping the least recently used entries beyond TEMPLATE_BYTES_CACHE_SIZE."""
+    _template_bytes_cache[cache_key] = template_bytes
+    _template_bytes_cache.move_to_end(cache_key)
+    while len(_template_bytes_cache) > TEMPLATE_BYTES_CACHE_SIZE:
+        _template_bytes_cache.popitem(last=False)
+
+@functools.lru_cache(maxsize=4)
+def _read_blank_template(template_path: str, mtime_ns: int) -> bytes:
+    """Blank template file contents; mtime_ns is part of the cache key so edited files are re-read."""
+    return Path(template_path).read_bytes()
+
+# Config keys of pages that get form fields ("page_1", "page_2", ...)
+PAGE_KEY_PATTERN = re.compile(r"page_([1-9][0-9]*)")
 
 class A3TemplateProcessor:
     """Processes A3 templates by adding form fields and populating them."""
     
+    # Options for PDFs written to disk: drop unused objects, compress streams, images and fonts
+    FINAL_SAVE_OPTIONS = {"garbage": 4, "deflate": True, "clean": True, "deflate_images": True, "deflate_fonts": True}
+    
+    # Section match results kept per processor before the cache is reset
+    MATCH_CACHE_SIZE = 1024
+    
     def __init__(self, template_path: Path = None, custom_fields_config: Dict = None):
         """Initialize with the blank template."""
         self.template_path = template_path or Path("A3_templates/More4Life A3 Goals - blank.pdf")
         self.form_fields_config = custom_fields_config or self._get_default_form_fields_config()
         
+        # Output directories already created by this processor
+        self._created_dirs = set()
+    
+    @property
+    def form_fields_config(self) -> Dict[str, List[Dict]]:
+        """Field layout per page; assigning a new config re-prepares the widgets and field indexes."""
+        return self._form_fields_config
+    
+    @form_fields_config.setter
+    def form_fields_config(self, config: Dict[str, List[Dict]]):
+        self._form_fields_config = config
+        self._prepared_fields = self._prepare_fields()
+        self._index_fields()
+        self._match_cache = {}
+    
     def _get_default_form_fields_config(self) -> Dict[str, List[Dict]]:
-        """Define where form fields should be placed on each page."""
-        return {
-            "page_1": [
-                # Circle content areas (left side)
-                {"name": "dangers_content", "rect": [50, 200, 280, 300], "type": "text", "multiline": True},
-                {"name": "opportunities_content", "rect": [50, 350, 280, 450], "type": "text", "multiline": True},
-                {"name": "strengths_content", "rect": [50, 500, 280, 600], "type": "text", "multiline": True},
-                
-                # Right side content areas
-                {"name": "financial_info", "rect": [320, 200, 550, 300], "type": "text", "multiline": True},
-                {"name": "career_plans", "rect": [320, 350, 550, 450], "type": "text", "multiline": True},
-                {"name": "additional_notes", "rect": [320, 500, 550, 600], "type": "text", "multiline": True},
-            ],
-            "page_2": [
-                # Money column
-                {"name": "money_goals", "rect": [50, 150, 160, 250], "type": "text", "multiline": True},
-                {"name": "money_now", "rect": [50, 300, 160, 400], "type": "text", "multiline": True},
-                {"name": "money_todo", "rect": [50, 450, 160, 550], "type": "text", "multiline": True},
-                
-                # Business column
-                {"name": "business_goals", "rect": [170, 150, 280, 250], "type": "text", "multiline": True},
-                {"name": "business_now", "rect": [170, 300, 280, 400], "type": "text", "multiline": True},
-                {"name": "business_todo", "rect": [170, 450, 280, 550], "type": "text", "multiline": True},
-                
-                # Leisure column
-                {"name": "leisure_goals", "rect": [290, 150, 400, 250], "type": "text", "multiline": True},
-                {"name": "leisure_now", "rect": [290, 300, 400, 400], "type": "text", "multiline": True},
-                {"name": "leisure_todo", "rect": [290, 450, 400, 550], "type": "text", "multiline": True},
-                
-                # Health column
-                {"name": "health_goals", "rect": [410, 150, 520, 250], "type": "text", "multiline": True},
-                {"name": "health_now", "rect": [410, 300, 520, 400], "type": "text", "multiline": True},
-                {"name": "health_todo", "rect": [410, 450, 520, 550], "type": "text", "multiline": True},
-                
-                # Family column
-                {"name": "family_goals", "rect": [530, 150, 640, 250], "type": "text", "multiline": True},
-                {"name": "family_now", "rect": [530, 300, 640, 400], "type": "text", "multiline": True},
-                {"name": "family_todo", "rect": [530, 450, 640, 550], "type": "text", "multiline": True},
-            ]
-        }
+        """Define where form fields should be placed on each page (the shared, read-only default)."""
+        return DEFAULT_FORM_FIELDS_CONFIG
+    
+    def _template_cache_key(self) -> Tuple[str, int, str]:
+        """Key of the built template in the template bytes cache: template file, its mtime and the field config hash."""
+        config_json = json.dumps(self.form_fields_config, sort_keys=True)
+        return (
+            str(self.template_path),
+            self.template_path.stat().st_mtime_ns,
+            hashlib.sha256(config_json.encode('utf-8')).hexdigest()
+        )
     
-    def create_template_with_form_fields(self, output_path: Path = None) -> Path:
-        """Create a template with interactive form fields."""
+    def _build_template_doc(self) -> fitz.Document:
+        """Open the blank template and add the configured form fields in memory."""
         if not self.template_path.exists():
             raise FileNotFoundError(f"Template not found: {self.template_path}")
         
-        output_path = output_path or Path("processed_documents/A3_template_with_fields.pdf")
-        output_path.parent.mkdir(exist_ok=True)
+        # Reuse a previous build while neither the template file nor the field config has changed
+        cache_key = self._template_cache_key()
+        cached_bytes = _get_template_bytes(cache_key)
+        if cached_bytes is not None:
+            return fitz.open("pdf", cached_bytes)
         
-        # Open the blank template
-        doc = fitz.open(self.template_path)
+        # Open the blank template from its cached bytes
+        template_path, mtime_ns, _ = cache_key
+        doc = fitz.open("pdf", _read_blank_template(template_path, mtime_ns))
         
         try:
-            # Add form fields to each page
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_key = f"page_{page_num + 1}"
+            # Add form fields to the configured pages only: build all widgets first, then attach them in one tight loop
+            for page_index, fields in self._prepared_fields.items():
+                if page_index >= len(doc):
+                    continue
+                page = doc[page_index]
                 
-                if page_key in self.form_fields_config:
-                    for field_config in self.form_fields_config[page_key]:
-                        self._add_form_field(page, field_config)
+                widgets = []
+                for field in fields:
+                    error = self.validate_field_config(field["config"], page.rect)
+                    if error:
+                        print(f"⚠️ Failed to add form field {field['name']}: {error}")
+                        continue
+                    widgets.append(self._build_widget(field))
+                for widget in widgets:
+                    try:
+                        page.add_widget(widget)
+                    except Exception as e:
+                        print(f"⚠️ Failed to add form field {widget.field_name}: {e}")
             
+            # Intermediate copy only: light deflate, the full FINAL_SAVE_OPTIONS pass runs on the real output
+            _put_template_bytes(cache_key, doc.tobytes(deflate=True))
+        except Exception:
+            doc.close()
+            raise
+        
+        return doc
+    
+    def create_template_with_form_fields(self, output_path: Path = None, return_doc: bool = False):
+        """Create a template with interactive form fields.
+        
+        With return_doc=True nothing is written; the open in-memory document is
+        returned instead (the caller is responsible for closing it).
+        """
+        doc = self._build_template_doc()
+        if return_doc:
+            return doc
+        
+        output_path = output_path or Path("processed_documents/A3_template_with_fields.pdf")
+        self._ensure_parent_dir(output_path)
+        
+        try:
             # Save the template with form fields
-            doc.save(str(output_path))
+            doc.save(str(output_path), **self.FINAL_SAVE_OPTIONS)
             print(f"✅ Created template with form fields: {output_path}")
             return output_path
             
         finally:
             doc.close()
     
-    def _add_form_field(self, page: fitz.Page, field_config: Dict):
-        """Add a single form field to a page with transparent/seamless appearance."""
-        try:
-            field_name = field_config["name"]
-            rect = fitz.Rect(field_config["rect"])
-            
-            # Create text widget with transparent appearance
-            widget = fitz.Widget()
-            widget.field_name = field_name
-            widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
-            widget.field_flags = fitz.PDF_TX_FIELD_IS_MULTILINE if field_config.get("multiline") else 0
-            widget.rect = rect
-            widget.text_font = "helv"
-            widget.text_fontsize = field_config.get("fontsize", 10)
-            
-            # Transparent/seamless appearance
-            widget.fill_color = None  # No background fill
-            widget.border_color = None  # No border
-            widget.border_width = 0  # No border width
-            
-            # Text appearance
-            widget.text_color = (0, 0, 0)  # Black text
-            
-            # Add the widget to the page
-            page.add_widget(widget)
+    def _prepare_fields(self) -> Dict[int, List[Dict]]:
+        """Parse the field configuration once into widget settings keyed by 0-based page index."""
+        prepared_fields = {}
+        prototypes = {}  # one configured widget per (flags, fontsize), copied per field
+        for page_key, fields in self.form_fields_config.items():
+            page_match = PAGE_KEY_PATTERN.fullmatch(page_key)
+            if not page_match:
+                continue
             
-        except Exception as e:
-            print(f"⚠️ Failed to add form field {field_config.get('name', 'unknown')}: {e}")
+            page_index = int(page_match.group(1)) - 1
+            prepared_fields[page_index] = []
+            for field_config in fields:
+                error = self.validate_field_config(field_config)
+                if error:
+                    print(f"⚠️ Failed to add form field {field_config.get('name', 'unknown')}: {error}")
+                    continue
+                
+                flags = fitz.PDF_TX_FIELD_IS_MULTILINE if field_config.get("multiline") else 0
+                fontsize = field_config.get("fontsize", 10)
+                if (flags, fontsize) not in prototypes:
+                    prototypes[(flags, fontsize)] = self._widget_prototype(flags, fontsize)
+                
+                prepared_fields[page_index].append({
+                    "name": field_config["name"],
+                    "rect": fitz.Rect(field_config["rect"]),
+                    "prototype": prototypes[(flags, fontsize)],
+                    "config": field_config  # for the page-bounds check once the page is open
+                })
+        
+        return prepared_fields
+    
+    @staticmethod
+    def validate_field_config(field_config: Dict, page_rect: fitz.Rect = None) -> str:
+        """Reason a configured field cannot be added, or None if it is usable.
+        
+        Shared with create_pdf_template so both template builders accept the same configs;
+        with page_rect the field must also lie inside the page.
+        """
+        if "name" not in field_config:
+            return "missing 'name'"
+        
+        rect = field_config.get("rect")
+        if not isinstance(rect, (list, tuple)) or len(rect) != 4 or not all(isinstance(value, (int, float)) for value in rect):
+            return f"'rect' must be 4 numbers, got {rect!r}"
+        
+        x1, y1, x2, y2 = rect
+        if x2 <= x1 or y2 <= y1:
+            return f"'rect' must be [x1, y1, x2, y2] with x1 < x2 and y1 < y2, got {rect!r}"
+        
+        if page_rect is not None and (x1 < page_rect.x0 or y1 < page_rect.y0 or x2 > page_rect.x1 or y2 > page_rect.y1):
+            return f"'rect' {rect!r} lies outside the page {tuple(page_rect)!r}"
+        
+        if not isinstance(field_config.get("fontsize", 10), (int, float)):
+            return f"'fontsize' must be a number, got {field_config['fontsize']!r}"
+        
+        return None
+    
+    def _widget_prototype(self, flags: int, fontsize: float) -> fitz.Widget:
+        """Text widget with the shared transparent/seamless settings, not yet attached to a page."""
+        # Create text widget with transparent appearance
+        widget = fitz.Widget()
+        widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+        widget.field_flags = flags
+        widget.text_font = "helv"
+        widget.text_fontsize = fontsize
+        
+        # Transparent/seamless appearance
+        widget.fill_color = None  # No background fill
+        widget.border_color = None  # No border
+        widget.border_width = 0  # No border width
+        
+        # Text appearance
+        widget.text_color = (0, 0, 0)  # Black text
+        
+        return widget
+    
+    def _ensure_parent_dir(self, output_path: Path):
+        """Create the output file's parent directories once per processor."""
+        parent = output_path.parent
+        if parent not in self._created_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(parent)
+    
+    def _build_widget(self, field: Dict) -> fitz.Widget:
+        """Build the transparent/seamless widget for a prepared form field (no page side effects)."""
+        # Copy the shared prototype; only name and position differ per field
+        widget = copy.copy(field["prototype"])
+        widget.field_name = field["name"]
+        widget.rect = field["rect"]
+        return widget
     
     def create_empty_template(self, output_path: Path = None) -> Path:
         """Create a template with empty text fields ready for manual population."""
         if not output_path:
-            timestamp = int(time.time())
-            output_path = Path(f"processed_documents/A3_Empty_Template_{timestamp}.pdf")
-        
-        output_path.parent.mkdir(exist_ok=True)
+            # Random suffix: timestamps collide for calls within the same second
+            output_path = Path(f"processed_documents/A3_Empty_Template_{uuid.uuid4().hex[:12]}.pdf")
         
         # Just create and return the template with empty form fields
         return self.create_template_with_form_fields(output_path)
     
-    def populate_template(self, extracted_results: List[Dict[str, Any]], output_path: Path = None, base_template: Path = None) -> Path:
-        """Use existing template and automatically populate it with extracted text."""
+    def populate_template(self, extracted_results: List[Dict[str, Any]], output_path: Path = None, base_template: Path = None, regenerate_appearances: bool = True, verbose: bool = True) -> Path:
+        """Use existing template and automatically populate it with extracted text.
+        
+        With regenerate_appearances=False only the field values are written and the
+        document is flagged /NeedAppearances, leaving text rendering to the viewer.
+        This is faster for large text, but viewers that ignore the flag show empty fields.
+        Per-field messages go to the module logger at DEBUG level; verbose=False also
+        silences the summary prints (used by populate_many workers).
+        """
         if not output_path:
-            timestamp = int(time.time())
-            output_path = Path(f"processed_documents/A3_Populated_{timestamp}.pdf")
+            output_path = Path(f"processed_documents/A3_Populated_{uuid.uuid4().hex[:12]}.pdf")
         
-        output_path.parent.mkdir(exist_ok=True)
+        self._ensure_parent_dir(output_path)
         
-        # Use existing template if provided, otherwise create new one
+        # Use existing template if provided, otherwise add the form fields in memory
         if base_template and base_template.exists():
-            template_with_fields = base_template
-            print(f"✅ Using existing template: {template_with_fields}")
+            doc = fitz.open(base_template)
+            if verbose:
+                print(f"✅ Using existing template: {base_template}")
         else:
-            # Fallback: create new template with form fields
-            template_with_fields = self.create_template_with_form_fields()
-            print(f"📝 Created new template: {template_with_fields}")
-        
-        # Open the template with form fields
-        doc = fitz.open(template_with_fields)
+            doc = self.create_template_with_form_fields(return_doc=True)
+            if verbose:
+                print(f"📝 Added form fields to blank template: {self.template_path}")
         
         try:
             # Map extracted text to form fields
             field_mappings = self._map_text_to_fields(extracted_results)
             
-            print(f"🎯 Populating {len(field_mappings)} fields with extracted text...")
+            if verbose:
+                print(f"🎯 Populating {len(field_mappings)} fields with extracted text...")
             
             # Populate the form fields with page-specific mapping
             populated_count = 0
             
             # Get page mapping for fields
-            field_to_page = {}
-            for page_key, fields in self.form_fields_config.items():
-                page_number = 0 if page_key == 'page_1' else 1  # Convert to 0-based indexing
-                for field in fields:
-                    field_to_page[field['name']] = page_number
+            field_to_page = self._field_page_numbers
             
-            for field_name, text_content in field_mappings.items():
-                if text_content.strip():
-                    try:
-                        # Get the correct page for this field
-                        target_page_num = field_to_page.get(field_name)
+            # Index widgets by (page, name) in one pass; the first widget with a name wins
+            pages = list(doc)  # keep pages alive while their widgets are used
+            widget_index = {}
+            for page_num, page in enumerate(pages):
+                for widget in page.widgets():
+                    widget_index.setdefault((page_num, widget.field_name), widget)
+            
+            # Assign all values first, then regenerate appearances in a single pass
+            assigned_widgets = []
+            # Mapped text is stripped once in _map_sections; only empty values need skipping here
+            for field_name, value in field_mappings.items():
+                if not value:
+                    continue
+                
+                try:
+                    # Get the correct page for this field
+                    target_page_num = field_to_page.get(field_name)
+                    
+                    if target_page_num is not None and target_page_num < len(doc):
+                        widget = widget_index.get((target_page_num, field_name))
                         
-                        if target_page_num is not None and target_page_num < len(doc):
-                            page = doc[target_page_num]
-                            widgets = page.widgets()
-                            
-                            field_found = False
-                            for widget in widgets:
-                                if widget.field_name == field_name:
-                                    widget.field_value = text_content.strip()
-                                    widget.update()
-                                    populated_count += 1
-                                    print(f"   ✅ Page {target_page_num + 1} - {field_name}: {text_content[:50]}...")
-                                    field_found = True
-                                    break
-                            
-                            if not field_found:
-                                print(f"   ⚠️ Field '{field_name}' not found on Page {target_page_num + 1}")
+                        if widget:
+                            # Unchanged values (e.g. from a pre-filled base template) keep their appearance
+                            if widget.field_value == value:
+                                continue
+                            widget.field_value = value
+                            assigned_widgets.append((field_name, target_page_num, value, widget))
                         else:
-                            print(f"   ❌ Invalid page mapping for field '{field_name}'")
-                            
-                    except Exception as e:
-                        print(f"⚠️ Failed to populate field {field_name}: {e}")
+                            logger.debug("Field '%s' not found on Page %d", field_name, target_page_num + 1)
+                    else:
+                        logger.debug("Invalid page mapping for field '%s'", field_name)
+                
+                except Exception as e:
+                    logger.debug("Failed to populate field %s: %s", field_name, e)
+            
+            log_fields = logger.isEnabledFor(logging.DEBUG)
+            for field_name, target_page_num, value, widget in assigned_widgets:
+                try:
+                    if regenerate_appearances:
+                        widget.update()
+                    else:
+                        # Value-only write; no appearance stream is synthesized
+                        doc.xref_set_key(widget.xref, "V", fitz.get_pdf_str(widget.field_value))
+                    populated_count += 1
+                    if log_fields:
+                        logger.debug("Page %d - %s: %s...", target_page_num + 1, field_name, value[:50])
+                except Exception as e:
+                    logger.debug("Failed to populate field %s: %s", field_name, e)
             
-            print(f"✅ Successfully populated {populated_count} fields")
+            logger.info("Populated %d/%d fields", populated_count, len(field_mappings))
+            if verbose:
+                print(f"✅ Successfully populated {populated_count} fields")
             
-            # Save the completed document
-            doc.save(str(output_path))
-            print(f"📁 Saved populated template: {output_path}")
+            if not regenerate_appearances:
+                doc.need_appearances(True)
             
-            # Clean up temporary template (only if we created it, not if it's the base template)
-            if not base_template or template_with_fields != base_template:
-                try:
-                    if template_with_fields.exists():
-                        template_with_fields.unlink()
-                except Exception as cleanup_error:
-                    print(f"⚠️ Could not clean up temporary template: {cleanup_error}")
+            # Save the completed document
+            doc.save(str(output_path), **self.FINAL_SAVE_OPTIONS)
+            if verbose:
+                print(f"📁 Saved populated template: {output_path}")
             
             return output_path
             
         finally:
             doc.close()
     
-    def _map_text_to_fields(self, extracted_results: List[Dict[str, Any]]) -> Dict[str, str]:
-        """Map extracted text sections to appropriate form fields."""
-        field_mappings = {}
+    def populate_many(self, jobs: List[Tuple[List[Dict[str, Any]], Path]], max_workers: int = None, progress_callback=None) -> Dict[str, Any]:
+        """Populate many templates in parallel worker processes.
+        
+        Each job is (extracted_results, output_path). progress_callback, if given, is
+        called as progress_callback(completed, total, output_path, error) after each job.
+        The template with form fields is built once here and handed to each worker process.
+        """
+        start_time = time.time()
+        outputs = []
+        failed = []
         
-        # Get available field names from the current configuration
-        available_fields = {}
+        try:
+            self._build_template_doc().close()
+            template_bytes = _get_template_bytes(self._template_cache_key())
+        except Exception:
+            template_bytes = None  # workers build it themselves and report the error per job
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_populate_worker,
+            initargs=(self.template_path, self.form_fields_config, template_bytes)
+        ) as executor:
+            futures = {
+                executor.submit(_populate_worker, extracted_results, output_path): output_path
+                for extracted_results, output_path in jobs
+            }
+            
+            for completed, future in enumerate(as_completed(futures), 1):
+                output_path = futures[future]
+                error = None
+                try:
+                    outputs.append(future.result())
+                except Exception as e:
+                    error = str(e)
+                    failed.append({"output_path": output_path, "error": error})
+                    print(f"❌ Failed to populate {output_path}: {e}")
+                
+                if progress_callback:
+                    progress_callback(completed, len(futures), output_path, error)
+        
+        total_time = time.time() - start_time
+        print(f"✅ Populated {len(outputs)}/{len(jobs)} templates in {total_time:.2f}s")
+        
+        return {
+            "success": not failed,
+            "outputs": outputs,
+            "failed": failed,
+            "total_processing_time": total_time
+        }
+    
+    def _index_fields(self):
+        """Index configured field names by page (a name configured on several pages belongs to the last)."""
+        self._available_fields = {}
         for page_key, fields in self.form_fields_config.items():
             for field in fields:
-                available_fields[field['name']] = page_key
+                if 'name' in field:  # nameless fields are rejected by validate_field_config
+                    self._available_fields[field['name']] = page_key
+        
+        self._fields_by_page = {
+            page: {name: page_key for name, page_key in self._available_fields.items() if page_key == f"page_{page}"}
+            for page in (1, 2)
+        }
+        
+        # 0-based page index per field for populate_template
+        self._field_page_numbers = {
+            name: 0 if page_key == 'page_1' else 1  # Convert to 0-based indexing
+            for name, page_key in self._available_fields.items()
+        }
         
-        print(f"\n🎯 SMART FIELD MAPPING")
-        print(f"{'='*50}")
+        # Fallback field per page for sections no specific field matched
+        self._generic_fields = {
+            1: self._get_generic_page1_field(self._fields_by_page[1]),
+            2: self._get_generic_page2_field(self._fields_by_page[2])
+        }
+        
+        # Lower-cased name -> field name per page (the first configured name wins, as in a linear scan)
+        self._lower_to_name = {}
+        for page, page_fields in self._fields_by_page.items():
+            names = self._lower_to_name[page] = {}
+            for field_name in page_fields:
+                names.setdefault(field_name.lower(), field_name)
+        
+        # Page 1 content and branding rules resolved to this config's field names
+        self._page1_content_fields = [
+            (content_pattern, self._field_containing(self._fields_by_page[1], field_keywords))
+            for content_pattern, field_keywords in PAGE1_CONTENT_RULES
+        ]
+        branding_pattern, field_keywords = PAGE1_BRANDING_RULE
+        self._page1_branding_field = (branding_pattern, self._field_containing(self._fields_by_page[1], field_keywords))
+    
+    def _map_text_to_fields(self, extracted_results: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Map extracted text sections to appropriate form fields."""
+        # Only successful results with sections, for pages that have fields, can produce mappings
+        page_results = [
+            result for result in extracted_results
+            if result.get('success', False) and result.get('sections') and result.get('page_number', 1) in self._fields_by_page
+        ]
+        if not page_results:
+            logger.info("No page sections to map")
+            return {}
+        
+        field_mappings = {}
+        available_fields = self._available_fields
+        log_details = logger.isEnabledFor(logging.DEBUG)
         
         # Show page-specific field counts
-        page1_fields = [name for name, page in available_fields.items() if page == 'page_1']
-        page2_fields = [name for name, page in available_fields.items() if page == 'page_2']
-        print(f"📋 Page 1 fields ({len(page1_fields)}): {', '.join(page1_fields[:3])}{'...' if len(page1_fields) > 3 else ''}")
-        print(f"📋 Page 2 fields ({len(page2_fields)}): {', '.join(page2_fields[:3])}{'...' if len(page2_fields) > 3 else ''}")
+        if log_details:
+            for page, page_fields in self._fields_by_page.items():
+                logger.debug("Page %d fields (%d): %s", page, len(page_fields), ', '.join(list(page_fields)[:3]))
         
-        for result in extracted_results:
-            if not result.get('success', False):
-                continue
-                
+        section_count = 0
+        for result in page_results:
             page_num = result.get('page_number', 1)
             sections = result.get('sections', [])
+            section_count += len(sections)
             
-            print(f"\n📄 PROCESSING PAGE {page_num} ({'='*30})")
-            print(f"   📝 Found {len(sections)} text sections to map")
+            logger.debug("Processing page %d: %d text sections to map", page_num, len(sections))
             
-            if page_num == 1:
-                print(f"   🎯 Target: Page 1 fields only")
-                page_mappings = self._map_page1_sections(sections, available_fields)
-                field_mappings.update(page_mappings)
-            elif page_num == 2:
-                print(f"   🎯 Target: Page 2 fields only")
-                page_mappings = self._map_page2_sections(sections, available_fields)
-                field_mappings.update(page_mappings)
-        
-        print(f"\n✅ FINAL FIELD MAPPINGS:")
-        print(f"{'='*50}")
-        for field_name, text in field_mappings.items():
-            page_info = available_fields.get(field_name, 'unknown')
-            page_display = "Page 1" if page_info == 'page_1' else "Page 2" if page_info == 'page_2' else "Unknown"
-            print(f"🎯 [{page_display}] {field_name}: {text[:80]}{'...' if len(text) > 80 else ''}")
+            # A later result for the same page replaces the fields it maps
+            field_mappings.update(self._map_sections(sections, page_num))
         
+        if log_details:
+            for field_name, text in field_mappings.items():
+                page_info = available_fields.get(field_name, 'unknown')
+                page_display = "Page 1" if page_info == 'page_1' else "Page 2" if page_info == 'page_2' else "Unknown"
+                logger.debug("[%s] %s: %s", page_display, field_name, text[:80])
+        
+        logger.info("Mapped %d text sections to %d fields", section_count, len(field_mappings))
         return field_mappings
     
-    def _map_page1_sections(self, sections: List[Dict], available_fields: Dict[str, str] = None) -> Dict[str, str]:
-        """Map Page 1 sections to form fields using intelligent field matching."""
-        mappings = {}
-        available_fields = available_fields or {}
-        
-        # Filter to only Page 1 fields
-        page1_fields = {name: page for name, page in available_fields.items() if page == 'page_1'}
+    def _map_sections(self, sections: List[Dict], page: int) -> Dict[str, str]:
+        """Map one page's sections to that page's form fields using intelligent field matching."""
+        mappings = defaultdict(list)  # field name -> matched texts, joined once at the end
+        page_fields = self._fields_by_page[page]
+        log_details = logger.isEnabledFor(logging.DEBUG)
         
         for i, section in enumerate(sections):
             text = section.get('text', '').strip()
             location = section.get('location', '').lower()
             
-            if not text:
-                continue
+            if len(text) < 2:
+                continue  # empty or single-character OCR noise
             
-            print(f"  📝 Section {i+1}: '{text[:50]}...' at '{location}'")
+            if log_details:
+                logger.debug("Section %d: '%s' at '%s'", i + 1, text[:50], location)
             
-            # Try to find the best matching field for this text (Page 1 only)
-            best_field = self._find_best_field_match(text, location, page1_fields, page=1)
+            # Try to find the best matching field for this text (this page only)
+            best_field = self._find_best_field_match(text.lower(), location, page_fields, page=page)
             
             if best_field:
-                print(f"     ✅ Matched to Page 1 field: '{best_field}'")
-                if best_field in mappings:
-                    mappings[best_field] += '\n' + text
-                else:
-                    mappings[best_field] = text
+                logger.debug("Matched to Page %d field: '%s'", page, best_field)
+                mappings[best_field].append(text)
             else:
-                # Fallback to generic mapping if no specific field found (Page 1 only)
-                generic_field = self._get_generic_page1_field(page1_fields)
+                # Fallback to generic mapping if no specific field found (this page only)
+                generic_field = self._generic_fields[page]
+                
                 if generic_field:
-                    print(f"     🔄 Using Page 1 fallback field: '{generic_field}'")
-                    if generic_field in mappings:
-                        mappings[generic_field] += '\n' + text
-                    else:
-                        mappings[generic_field] = text
+                    logger.debug("Using Page %d fallback field: '%s'", page, generic_field)
+                    mappings[generic_field].append(text)
                 else:
-                    print(f"     ❌ No Page 1 field match found - text will be skipped")
+                    logger.debug("No Page %d field match found - text will be skipped", page)
         
-        return mappings
+        return {field_name: '\n'.join(texts) for field_name, texts in mappings.items()}
     
-    def _map_page2_sections(self, sections: List[Dict], available_fields: Dict[str, str] = None) -> Dict[str, str]:
-        """Map Page 2 sections to form fields using intelligent field matching."""
-        mappings = {}
-        available_fields = available_fields or {}
-        
-        # Filter to only Page 2 fields
-        page2_fields = {name: page for name, page in available_fields.items() if page == 'page_2'}
+    def _find_best_field_match(self, text_lower: str, location_lower: str, available_fields: Dict[str, str], page: int) -> str:
+        """Find the best matching field name for already lower-cased text and location.
         
-        for i, section in enumerate(sections):
-            text = section.get('text', '').strip()
-            location = section.get('location', '').lower()
-            
-            if not text:
-                continue
-            
-            print(f"  📝 Section {i+1}: '{text[:50]}...' at '{location}'")
-            
-            # Try to find the best matching field for this text (Page 2 only)
-            best_field = self._find_best_field_match(text, location, page2_fields, page=2)
-            
-            if best_field:
-                print(f"     ✅ Matched to Page 2 field: '{best_field}'")
-                if best_field in mappings:
-                    mappings[best_field] += '\n' + text
-                else:
-                    mappings[best_field] = text
-            else:
-                # Fallback to generic mapping if no specific field found (Page 2 only)
-                generic_field = self._get_generic_page2_field(page2_fields)
-                if generic_field:
-                    print(f"     🔄 Using Page 2 fallback field: '{generic_field}'")
-                    if generic_field in mappings:
-                        mappings[generic_field] += '\n' + text
-                    else:
-                        mappings[generic_field] = text
-                else:
-                    print(f"     ❌ No Page 2 field match found - text will be skipped")
-        
-        return mappings
-    
-    def _find_best_field_match(self, text: str, location: str, available_fields: Dict[str, str], page: int) -> str:
-        """Find the best matching field name for given text and location using sophisticated mapping."""
-        text_lower = text.lower()
-        location_lower = location.lower()
+        Results are cached per (text, location, page); available_fields is always the page's
+        field dict, and the cache is reset whenever form_fields_config changes.
+        """
+        cache_key = (text_lower, location_lower, page)
+        if cache_key in self._match_cache:
+            return self._match_cache[cache_key]
         
         if page == 1:
-            return self._match_page1_field(text_lower, location_lower, available_fields)
+            field_name = self._match_page1_field(text_lower, location_lower, available_fields)
         elif page == 2:
-            return self._match_page2_field(text_lower, location_lower, available_fields)
+            field_name = self._match_page2_field(text_lower, location_lower, available_fields)
+        else:
+            field_name = None
         
+        if len(self._match_cache) >= self.MATCH_CACHE_SIZE:
+            self._match_cache.clear()
+        self._match_cache[cache_key] = field_name
+        return field_name
+    
+    def _field_containing(self, available_fields: Dict[str, str], keywords: Tuple[str, ...]) -> str:
+        """First available field whose lower-cased name contains all keywords."""
+        for field_name in available_fields.keys():
+            name_lower = field_name.lower()
+            if all(keyword in name_lower for keyword in keywords):
+                return field_name
         return None
     
     def _match_page1_field(self, text_lower: str, location_lower: str, available_fields: Dict[str, str]) -> str:
         """Match Page 1 text to specific field names based on content and position."""
         
         # Check for specific content matches first
-        if any(keyword in text_lower for keyword in ['danger', 'eliminate', 'risk', 'threat', 'avoid', 'prevent']):
-            for field_name in available_fields.keys():
-                if 'danger' in field_name.lower() and 'eliminate' in field_name.lower():
-                    return field_name
-        
-        if any(keyword in text_lower for keyword in ['opportunit', 'focus', 'capture', 'chance', 'potential']):
-            for field_name in available_fields.keys():
-                if 'opportunit' in field_name.lower() and 'focus' in field_name.lower():
-                    return field_name
-        
-        if any(keyword in text_lower for keyword in ['strength', 'reinforce', 'maximi', 'strong', 'advantage']):
-            for field_name in available_fields.keys():
-                if 'strength' in field_name.lower() and 'reinforce' in field_name.lower():
-                    return field_name
+        for content_pattern, field_name in self._page1_content_fields:
+            if field_name and content_pattern.search(text_lower):
+                return field_name
         
         # Position-based matching for right-side fields
-        if any(pos in location_lower for pos in ['right', 'center right', 'middle right']):
+        if PAGE1_RIGHT_SIDE_PATTERN.search(location_lower):
             # Try to match to specific right-side fields based on vertical position
-            if any(pos in location_lower for pos in ['top', 'upper', 'high']):
-                for field_name in available_fields.keys():
-                    if field_name.lower() == 'right_mid':
-                        return field_name
-            elif any(pos in location_lower for pos in ['middle', 'center', 'mid']):
-                for field_name in available_fields.keys():
-                    if field_name.lower() == 'right_belowmid':
-                        return field_name
-            elif any(pos in location_lower for pos in ['bottom', 'lower', 'down']):
-                for field_name in available_fields.keys():
-                    if field_name.lower() == 'right_bottom':
-                        return field_name
+            target_field = _first_rule_match(PAGE1_RIGHT_SIDE_ROW_RULES, location_lower)
+            if target_field:
+                field_name = self._lower_to_name[1].get(target_field)
+                if field_name:
+                    return field_name
         
         # Check for More4Life signature/branding
-        if any(keyword in text_lower for keyword in ['more4life', 'm4lfs', 'brookvale', 'dale street']):
-            for field_name in available_fields.keys():
-                if 'more4life' in field_name.lower():
-                    return field_name
+        branding_pattern, field_name = self._page1_branding_field
+        if field_name and branding_pattern.search(text_lower):
+            return field_name
         
         return None
     
     def _match_page2_field(self, text_lower: str, location_lower: str, available_fields: Dict[str, str]) -> str:
         """Match Page 2 text to specific field names based on content and position."""
         
-        # 🎯 MANUAL POSITION TO FIELD MAPPING (User-defined)
-        # Order matters! Check most specific patterns first
-        manual_position_mapping = [
-            # Row 2 (GOALS) - Most specific first (handle both hyphen variants)
-            ("second row center-right", "health_goals"),  # With hyphen
-            ("second row center right", "health_goals"),  # Without hyphen  
-            ("second row center-left", "business_goals"),
-            ("second row center", "leisure_goals"),
-            ("second row left", "money_goals"),
-            ("second row right", "family_goals"),
-            
-            # Row 3 (NOW) - Most specific first (handle both hyphen variants)
-            ("third row center-right", "health_now"),
-            ("third row center right", "health_now"),
-            ("third row center-left", "business_now"),
-            ("third row center left", "business_now"),
-            ("third row center", "leisure_now"),
-            ("third row left", "money_now"),
-            ("third row right", "family_now"),
-            
-            # Row 4 (TO DO) - Most specific first (handle both hyphen variants)
-            ("fourth row center-right", "health_todo"),
-            ("fourth row center right", "health_todo"),
-            ("fourth row center-left", "business_todo"),
-            ("fourth row center left", "business_todo"),
-            ("fourth row center", "leisure_todo"),
-            ("fourth row left", "money_todo"),
-            ("fourth row right", "family_todo")
-        ]
-        
         # Check manual mappings FIRST (highest priority) - most specific first
-        for position_key, field_name in manual_position_mapping:
-            if position_key in location_lower:
-                if field_name in available_fields:
-                    print(f"     🎯 Manual mapping: '{position_key}' → '{field_name}'")
-                    return field_name
+        if PAGE2_MANUAL_POSITION_PATTERN.search(location_lower):
+            for position_key, field_name in PAGE2_MANUAL_POSITION_MAPPING:
+                if position_key in location_lower:
+                    if field_name in available_fields:
+                        logger.debug("Manual mapping: '%s' -> '%s'", position_key, field_name)
+                        return field_name
         
         # Category-based matching (money, business, leisure, health, family)
         category = None
-        if any(keyword in text_lower for keyword in ['money', 'financial', 'finance', '$', 'dollar', 'cash', 'income', 'salary']):
-            category = 'money'
-        elif any(keyword in text_lower for keyword in ['business', 'work', 'career', 'job', 'company', 'office']):
-            category = 'business'
-        elif any(keyword in text_lower for keyword in ['leisure', 'hobby', 'fun', 'vacation', 'travel', 'entertainment']):
-            category = 'leisure'
-        elif any(keyword in text_lower for keyword in ['health', 'fitness', 'medical', 'doctor', 'exercise', 'diet']):
-            category = 'health'
-        elif any(keyword in text_lower for keyword in ['family', 'child', 'kids', 'spouse', 'parent', 'home']):
-            category = 'family'
+        if PAGE2_ANY_CATEGORY_PATTERN.search(text_lower):
+            category = _first_rule_match(PAGE2_CATEGORY_RULES, text_lower)
         
         if category:
             # Determine if it's GOALS, NOW, or TO DO based on content
-            field_type = None
-            if any(keyword in text_lower for keyword in ['goal', 'want', 'wish', 'dream', 'aim', 'target']):
-                field_type = 'goals'
-            elif any(keyword in text_lower for keyword in ['now', 'current', 'today', 'present', 'doing']):
-                field_type = 'now'
-            elif any(keyword in text_lower for keyword in ['todo', 'to do', 'action', 'plan', 'next', 'will']):
-                field_type = 'todo'
+            field_type = _first_rule_match(PAGE2_FIELD_TYPE_RULES, text_lower)
             
             # Try to match based on position if content doesn't give clear indication
             if not field_type:
-                if any(pos in location_lower for pos in ['top', 'upper', 'first']):
-                    field_type = 'goals'
-                elif any(pos in location_lower for pos in ['middle', 'center']):
-                    field_type = 'now'
-                elif any(pos in location_lower for pos in ['bottom', 'lower', 'last']):
-                    field_type = 'todo'
+                field_type = _first_rule_match(PAGE2_POSITION_FIELD_TYPE_RULES, location_lower)
             
             # Find the exact field name
             if field_type:
-                target_field = f"{category}_{field_type}"
-                for field_name in available_fields.keys():
-                    if field_name.lower() == target_field:
-                        return field_name
+                field_name = self._lower_to_name[2].get(f"{category}_{field_type}")
+                if field_name:
+                    return field_name
         
         # Position-based fallback matching for columns
-        if any(pos in location_lower for pos in ['left', 'first column']):
-            # Money column
-            if any(pos in location_lower for pos in ['top', 'upper']):
-                return 'money_goals'
-            elif any(pos in location_lower for pos in ['middle', 'center']):
-                return 'money_now'
-            elif any(pos in location_lower for pos in ['bottom', 'lower']):
-                return 'money_todo'
-        elif any(pos in location_lower for pos in ['center left', 'second column']):
-            # Business column
-            if any(pos in location_lower for pos in ['top', 'upper']):
-                return 'business_goals'
-            elif any(pos in location_lower for pos in ['middle', 'center']):
-                return 'business_now'
-            elif any(pos in location_lower for pos in ['bottom', 'lower']):
-                return 'business_todo'
-        elif any(pos in location_lower for pos in ['center', 'middle column', 'third column']):
-            # Leisure column
-            if any(pos in location_lower for pos in ['top', 'upper']):
-                return 'leisure_goals'
-            elif any(pos in location_lower for pos in ['middle', 'center']):
-                return 'leisure_now'
-            elif any(pos in location_lower for pos in ['bottom', 'lower']):
-                return 'leisure_todo'
-        elif any(pos in location_lower for pos in ['center right', 'fourth column']):
-            # Health column
-            if any(pos in location_lower for pos in ['top', 'upper']):
-                return 'health_goals'
-            elif any(pos in location_lower for pos in ['middle', 'center']):
-                return 'health_now'
-            elif any(pos in location_lower for pos in ['bottom', 'lower']):
-                return 'health_todo'
-        elif any(pos in location_lower for pos in ['right', 'last column', 'fifth column']):
-            # Family column
-            if any(pos in location_lower for pos in ['top', 'upper']):
-                return 'family_goals'
-            elif any(pos in location_lower for pos in ['middle', 'center']):
-                return 'family_now'
-            elif any(pos in location_lower for pos in ['bottom', 'lower']):
-                return 'family_todo'
+        column = _first_rule_match(PAGE2_COLUMN_RULES, location_lower)
+        if column:
+            row = _first_rule_match(PAGE2_COLUMN_ROW_RULES, location_lower)
+            if row:
+                return f"{column}_{row}"
         
         return None
     
@@ -539,8 +786,11 @@ class A3TemplateProcessor:
         config_path = config_path or Path("custom_field_positions.json")
         
         try:
-            with open(config_path, 'w') as f:
-                json.dump(self.form_fields_config, f, indent=2)
+            data = orjson.dumps(self.form_fields_config, option=orjson.OPT_INDENT_2) if ORJSON_AVAILABLE else None
+            if data is None or not data.isascii():
+                # Keep the file ASCII (escaped like json.dump) so readers using the platform encoding still work
+                data = json.dumps(self.form_fields_config, indent=2).encode('ascii')
+            config_path.write_bytes(data)
             print(f"✅ Saved field configuration to: {config_path}")
             print(f"📝 Edit this file to customize field positions")
             return config_path
@@ -557,8 +807,8 @@ class A3TemplateProcessor:
                 print(f"⚠️ Config file not found: {config_path}")
                 return self._get_default_form_fields_config()
             
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            data = config_path.read_bytes()
+            config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
             print(f"✅ Loaded custom field configuration from: {config_path}")
             return config
         except Exception as e:
@@ -580,6 +830,20 @@ class A3TemplateProcessor:
             # Restore original config
             self.form_fields_config = original_config
 
+# Processor of the current populate_many worker process, set up once by _init_populate_worker
+_worker_processor = None
+
+def _init_populate_worker(template_path: Path, form_fields_config: Dict, template_bytes: bytes):
+    """Process-pool initializer for populate_many: one processor per worker, seeded with the built template."""
+    global _worker_processor
+    _worker_processor = A3TemplateProcessor(template_path, form_fields_config)
+    if template_bytes is not None:
+        _put_template_bytes(_worker_processor._template_cache_key(), template_bytes)
+
+def _populate_worker(extracted_results: List[Dict[str, Any]], output_path: Path) -> Path:
+    """Process-pool entry point for populate_many (module level so it can be pickled)."""
+    return _worker_processor.populate_template(extracted_results, output_path, verbose=False)
+
 def test_template_processor():
     """Test the template processor."""
     print("🧪 Testing A3 Template Processor")
@@ -9,6 +9,30 @@ import sys
 import shutil
 import subprocess
 from pathlib import Path
+from datetime import date
+
+# Binaries known to break or gain nothing under UPX compression
+UPX_EXCLUDES = ["vcruntime140.dll", "python3.dll", f"python{sys.version_info.major}{sys.version_info.minor}.dll"]
+
+# Persistent PyInstaller cache and work folder, reused so incremental builds skip re-analysis
+# and re-processing of unchanged binaries (set A3_CLEAN_BUILD=1 or run "Clean build files" to remove it)
+PYINSTALLER_CACHE_DIR = Path.home() / ".cache" / "pyinstaller" / "a3_automation"
+
+# Never imported by the app or its bundled scripts; keeps them out of the bundle and its startup imports
+EXCLUDED_MODULES = [
+    "test",
+    "tkinter.test",
+    "lib2to3",
+    "pydoc_data",
+    "setuptools",
+    "distutils",
+    "pytest",
+    "IPython",
+    "notebook",
+    "matplotlib",
+    "scipy",
+    "numpy.testing",
+]
 
 def build_executable():
     """Build the A3 Automation executable using PyInstaller"""
@@ -61,22 +85,43 @@ def build_executable():
     # Build PyInstaller command with antivirus-friendly options
     cmd = [
         sys.executable, "-m", "PyInstaller",  # Use python -m PyInstaller instead of direct pyinstaller
-        "--onefile",                    # Single executable file
+        "--onedir",                     # Executable plus its files in a folder (no extraction on every launch)
+        "--noconfirm",                  # Replace an existing dist/ app folder without prompting
         "--windowed",                   # No console window (GUI only)
         "--name", app_name,             # Name of the executable
-        "--clean",                      # Clean PyInstaller cache
-        "--noupx",                      # Don't use UPX compression (reduces false positives)
+        "--workpath", str(PYINSTALLER_CACHE_DIR / "build"),  # Keep analysis results between builds
     ]
     
-    # Add data files
+    if os.environ.get("A3_CLEAN_BUILD"):
+        cmd.append("--clean")           # Clean PyInstaller cache
+        if PYINSTALLER_CACHE_DIR.exists():
+            shutil.rmtree(PYINSTALLER_CACHE_DIR)
+        print(f"🧹 Clean build requested (A3_CLEAN_BUILD): removed {PYINSTALLER_CACHE_DIR}")
+    
+    print(f"🗂️ PyInstaller cache and work folder: {PYINSTALLER_CACHE_DIR}")
+    
+    # UPX compression is opt-in: set A3_UPX_DIR to the folder containing upx.exe.
+    # Off by default because compressed binaries trigger more antivirus false positives.
+    upx_dir = os.environ.get("A3_UPX_DIR")
+    if upx_dir and Path(upx_dir).is_dir():
+        cmd.extend(["--upx-dir", upx_dir])
+        for pattern in UPX_EXCLUDES:
+            cmd.extend(["--upx-exclude", pattern])
+        print(f"🗜️ UPX compression enabled: {upx_dir}")
+    else:
+        cmd.append("--noupx")           # Don't use UPX compression (reduces false positives)
+    
+    # Add data files (all entries are top-level names, so one directory listing covers them)
+    present = {entry.name for entry in os.scandir(current_dir)}
     for src, dst in add_data:
-        if (current_dir / src).exists():
+        if src in present:
             cmd.extend(["--add-data", f"{src};{dst}"])
             print(f"📁 Including: {src}")
-        else:
-            print(f"⚠️  Warning: {src} not found, skipping...")
     
-    # Add hidden imports for common modules
+    for src in [src for src, _ in add_data if src not in present]:
+        print(f"⚠️  Warning: {src} not found, skipping...")
+    
+    # Add hidden imports for common modules (the app calls the OpenAI API through requests)
     hidden_imports = [
         "tkinter",
         "tkinter.filedialog",
@@ -84,12 +129,16 @@ def build_executable():
         "PIL",
         "fitz",
         "requests",
-        "openai",
+        "orjson",  # optional faster config JSON; only bundled when installed
     ]
     
     for module in hidden_imports:
         cmd.extend(["--hidden-import", module])
     
+    # Exclude modules the app never imports (test suites, dev tools, scientific stacks)
+    for module in EXCLUDED_MODULES:
+        cmd.extend(["--exclude-module", module])
+    
     # Add main file
     cmd.append(main_file)
     
@@ -97,19 +146,24 @@ def build_executable():
     print(f"Command: {' '.join(cmd)}")
     print()
     
-    # Run PyInstaller
+    # Run PyInstaller with its cache in the persistent per-user folder
+    env = os.environ.copy()
+    env["PYINSTALLER_CONFIG_DIR"] = str(PYINSTALLER_CACHE_DIR)
+    PYINSTALLER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
     try:
-        result = subprocess.run(cmd, cwd=current_dir, check=True)
+        result = subprocess.run(cmd, cwd=current_dir, check=True, env=env)
         
         if result.returncode == 0:
             print("\n✅ Build successful!")
             
             # Check if executable was created
-            exe_path = current_dir / "dist" / f"{app_name}.exe"
+            app_dir = current_dir / "dist" / app_name
+            exe_path = app_dir / f"{app_name}.exe"
             if exe_path.exists():
-                exe_size = exe_path.stat().st_size / (1024 * 1024)  # Size in MB
+                app_size = sum(f.stat().st_size for f in app_dir.rglob("*") if f.is_file()) / (1024 * 1024)  # Size in MB
                 print(f"📦 Executable created: {exe_path}")
-                print(f"📏 Size: {exe_size:.1f} MB")
+                print(f"📏 Size: {app_size:.1f} MB (application folder)")
                 
                 # Create distribution folder
                 dist_folder = current_dir / "A3_Distribution"
@@ -117,8 +171,9 @@ def build_executable():
                     shutil.rmtree(dist_folder)
                 dist_folder.mkdir()
                 
-                # Copy executable
-                shutil.copy2(exe_path, dist_folder / f"{app_name}.exe")
+                # Copy the application folder and zip it for sharing
+                shutil.copytree(app_dir, dist_folder / app_name)
+                zip_path = shutil.make_archive(str(dist_folder / app_name), "zip", dist_folder, app_name)
                 
                 # Create installer batch file
                 installer_content = f"""@echo off
@@ -129,8 +184,8 @@ echo.
 set INSTALL_DIR=%PROGRAMFILES%\\A3_Automation
 if not exist "%INSTALL_DIR%" mkdir "%INSTALL_DIR%"
 
-:: Copy executable
-copy "{app_name}.exe" "%INSTALL_DIR%\\{app_name}.exe"
+:: Copy the application folder
+xcopy "{app_name}" "%INSTALL_DIR%" /E /I /Y
 
 :: Create desktop shortcut
 set DESKTOP=%USERPROFILE%\\Desktop
@@ -157,8 +212,8 @@ pause
    - This will install the application and create a desktop shortcut
 
 2. **Manual Installation:**
-   - Copy `{app_name}.exe` to your desired location
-   - Run the executable directly
+   - Unzip `{app_name}.zip` (or copy the `{app_name}` folder) to your desired location
+   - Run `{app_name}.exe` inside that folder (keep it next to its other files)
 
 ## Features:
 - Automatic document processing with GPT-4o OCR
@@ -174,7 +229,7 @@ pause
 ## Support:
 For support or issues, contact the development team.
 
-Built on: {subprocess.run(['date', '/t'], capture_output=True, text=True, shell=True).stdout.strip()}
+Built on: {date.today().isoformat()}
 Version: {Path('version.txt').read_text().strip() if Path('version.txt').exists() else '1.0.0'}
 """
                 
@@ -182,7 +237,8 @@ Version: {Path('version.txt').read_text().strip() if Path('version.txt').exists(
                 readme_path.write_text(readme_content)
                 
                 print(f"\n📁 Distribution package created: {dist_folder}")
-                print(f"   - {app_name}.exe")
+                print(f"   - {app_name}/ ({app_name}.exe and its files)")
+                print(f"   - {Path(zip_path).name}")
                 print(f"   - install_a3.bat")
                 print(f"   - README.txt")
                 
@@ -224,6 +280,11 @@ def clean_build_files():
         spec_file.unlink()
         print(f"   Removed: {spec_file.name}")
     
+    # Remove the persistent PyInstaller cache and work folder (lives outside the project)
+    if PYINSTALLER_CACHE_DIR.exists():
+        shutil.rmtree(PYINSTALLER_CACHE_DIR)
+        print(f"   Removed: {PYINSTALLER_CACHE_DIR}")
+    
     print("✅ Cleanup complete")
 
 if __name__ == "__main__":
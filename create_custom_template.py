@@ -5,9 +5,15 @@ Uses your custom field configuration to create a PDF template
 """
 
 from pathlib import Path
-from a3_template_processor import A3TemplateProcessor
 import json
 
+# Optional faster JSON parsing for field configuration files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def create_custom_template():
     """Create a PDF template using custom field positions."""
     print("🎯 Creating Custom A3 Template")
@@ -22,11 +28,17 @@ def create_custom_template():
     
     try:
         # Load and display configuration
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        data = config_path.read_bytes()
+        config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
         
         print(f"✅ Loaded configuration from: {config_path}")
         
+        # An empty config must not reach the processor: it would silently fall back to the default layout
+        if not isinstance(config, dict) or not config:
+            print(f"❌ Configuration is empty or not a page mapping: {config_path}")
+            print(f"📝 Add fields with 'python create_field_config.py' or the field positioning tool")
+            return False
+        
         # Count fields
         page1_fields = len(config.get("page_1", []))
         page2_fields = len(config.get("page_2", []))
@@ -47,11 +59,14 @@ def create_custom_template():
             print(f"❌ Template not found: {template_path}")
             return False
         
-        processor = A3TemplateProcessor(template_path)
+        # Imported only once the inputs exist: it loads PyMuPDF
+        from a3_template_processor import A3TemplateProcessor
+        # Hand over the config parsed above instead of re-reading it from disk
+        processor = A3TemplateProcessor(template_path, custom_fields_config=config)
         
         # Create custom template
         output_path = Path("processed_documents/A3_Custom_Template.pdf")
-        final_template = processor.create_template_with_custom_fields(config_path, output_path)
+        final_template = processor.create_template_with_form_fields(output_path)
         
         print(f"\n🎉 SUCCESS!")
         print(f"✅ Created custom A3 template: {final_template}")
@@ -6,7 +6,6 @@ Generates a customizable JSON file for text field positions
 
 from pathlib import Path
 import json
-from a3_template_processor import A3TemplateProcessor
 
 def create_default_config():
     """Create a default field configuration file that can be easily edited."""
@@ -14,7 +13,8 @@ def create_default_config():
     print("=" * 50)
     
     try:
-        # Initialize processor to get default config
+        # Initialize processor to get default config (imported here: it loads PyMuPDF)
+        from a3_template_processor import A3TemplateProcessor
         processor = A3TemplateProcessor()
         
         # Save default configuration
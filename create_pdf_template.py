@@ -4,11 +4,18 @@ Create PDF Template from JSON Field Positions
 Takes a blank PDF and adds form fields based on JSON configuration
 """
 
+import copy
 import json
-import fitz  # PyMuPDF
 from pathlib import Path
 import sys
 
+# Optional faster JSON parsing for field configuration files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 def create_template_from_json(blank_pdf_path, json_config_path, output_path):
     """Create a PDF template with form fields from JSON configuration."""
     
@@ -20,14 +27,17 @@ def create_template_from_json(blank_pdf_path, json_config_path, output_path):
     
     # Load JSON configuration
     try:
-        with open(json_config_path, 'r') as f:
-            field_config = json.load(f)
+        data = Path(json_config_path).read_bytes()
+        field_config = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
         print(f"✅ Loaded field configuration")
     except Exception as e:
         print(f"❌ Failed to load JSON config: {e}")
         return None
     
-    # Open blank PDF
+    # Open blank PDF (PyMuPDF is only imported once there is a config to apply)
+    import fitz  # PyMuPDF
+    from a3_template_processor import A3TemplateProcessor
+    
     try:
         doc = fitz.open(blank_pdf_path)
         print(f"✅ Opened blank PDF ({len(doc)} pages)")
@@ -37,6 +47,19 @@ def create_template_from_json(blank_pdf_path, json_config_path, output_path):
     
     total_fields = 0
     
+    # Settings shared by every field; each field gets a shallow copy of this
+    # prototype (a Widget is bound to its annotation by add_widget, so the
+    # same object is not reused across calls)
+    prototype = fitz.Widget()
+    prototype.field_type = fitz.PDF_WIDGET_TYPE_TEXT
+    prototype.field_flags = fitz.PDF_TX_FIELD_IS_MULTILINE
+    
+    # Make fields transparent (no borders, no fill)
+    prototype.fill_color = None
+    prototype.border_color = None
+    prototype.border_width = 0
+    prototype.text_color = (0, 0, 0)  # Black text
+    
     # Process each page
     for page_key, fields in field_config.items():
         if not fields:
@@ -51,36 +74,36 @@ def create_template_from_json(blank_pdf_path, json_config_path, output_path):
         page = doc[page_num]
         print(f"📄 Processing {page_key}: {len(fields)} fields")
         
+        added = []
+        failed = []
+        
+        # Validate every field up front so bad entries never reach MuPDF
+        valid_fields = []
         for field in fields:
+            error = A3TemplateProcessor.validate_field_config(field, page.rect)
+            if error:
+                failed.append((field.get("name", "?"), error))
+            else:
+                valid_fields.append(field)
+        
+        for field in valid_fields:
             try:
-                # Create form field
-                rect = fitz.Rect(field["rect"])
-                
-                # Create the field widget
-                widget = fitz.Widget()
+                widget = copy.copy(prototype)
                 widget.field_name = field["name"]
-                widget.field_type = fitz.PDF_WIDGET_TYPE_TEXT
-                widget.rect = rect
-                widget.field_flags = fitz.PDF_TX_FIELD_IS_MULTILINE
-                
-                # Make field transparent (no borders, no fill)
-                widget.fill_color = None
-                widget.border_color = None
-                widget.border_width = 0
-                
-                # Set text properties
+                widget.rect = fitz.Rect(field["rect"])
                 widget.text_fontsize = field.get("fontsize", 10)
-                widget.text_color = (0, 0, 0)  # Black text
                 
-                # Add widget to page
-                annot = page.add_widget(widget)
-                annot.update()
-                
-                total_fields += 1
-                print(f"   ✅ Added field: {field['name']}")
+                # Add widget to page (add_widget already writes the appearance)
+                page.add_widget(widget)
+                added.append(field["name"])
                 
             except Exception as e:
-                print(f"   ❌ Failed to add field {field['name']}: {e}")
+                failed.append((field.get("name", "?"), e))
+        
+        total_fields += len(added)
+        print(f"   ✅ {page_key}: added {len(added)}/{len(fields)} fields")
+        for name, error in failed:
+            print(f"   ❌ Failed to add field {name}: {error}")
     
     # Save the template
     try:
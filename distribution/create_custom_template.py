@@ -5,7 +5,6 @@ Uses your custom field configuration to create a PDF template
 """
 
 from pathlib import Path
-from a3_template_processor import A3TemplateProcessor
 import json
 
 def create_custom_template():
@@ -47,6 +46,8 @@ def create_custom_template():
             print(f"❌ Template not found: {template_path}")
             return False
         
+        # Imported only once the inputs exist: it loads PyMuPDF
+        from a3_template_processor import A3TemplateProcessor
         processor = A3TemplateProcessor(template_path)
         
         # Create custom template
@@ -13,6 +13,13 @@ import io  # Add io import for BytesIO
 from PIL import Image, ImageTk
 from typing import Dict, List, Tuple
 
+# Optional faster JSON parsing/serialization for field configuration files
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 class FieldPositioningTool:
     """Interactive tool for positioning text fields on PDF templates."""
     
@@ -585,8 +592,11 @@ class FieldPositioningTool:
         
         if file_path:
             try:
-                with open(file_path, 'w') as f:
-                    json.dump(self.fields, f, indent=2)
+                data = orjson.dumps(self.fields, option=orjson.OPT_INDENT_2) if ORJSON_AVAILABLE else None
+                if data is None or not data.isascii():
+                    # Keep the file ASCII (escaped like json.dump) so readers using the platform encoding still work
+                    data = json.dumps(self.fields, indent=2).encode('ascii')
+                Path(file_path).write_bytes(data)
                 messagebox.showinfo("Success", f"Saved field configuration to:\n{file_path}")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to save configuration: {e}")
@@ -601,8 +611,8 @@ class FieldPositioningTool:
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    self.fields = json.load(f)
+                data = Path(file_path).read_bytes()
+                self.fields = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
                 self.draw_existing_fields()
                 self.update_fields_list()
                 messagebox.showinfo("Success", f"Loaded field configuration from:\n{file_path}")
@@ -622,19 +632,10 @@ class FieldPositioningTool:
         try:
             from a3_template_processor import A3TemplateProcessor
             
-            # Save current config temporarily
-            temp_config_path = Path("temp_field_config.json")
-            with open(temp_config_path, 'w') as f:
-                json.dump(self.fields, f, indent=2)
-            
-            # Create template with custom fields
-            processor = A3TemplateProcessor(self.pdf_path)
+            # Create template with the current fields (no temporary JSON round trip)
+            processor = A3TemplateProcessor(self.pdf_path, custom_fields_config=self.fields)
             output_path = Path("processed_documents/A3_Custom_Template.pdf")
-            template_path = processor.create_template_with_custom_fields(temp_config_path, output_path)
-            
-            # Clean up temp file
-            if temp_config_path.exists():
-                temp_config_path.unlink()
+            template_path = processor.create_template_with_form_fields(output_path)
             
             messagebox.showinfo("Success", f"Created PDF template with your custom fields:\n{template_path}")
             
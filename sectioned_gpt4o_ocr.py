@@ -7,7 +7,11 @@ Uses manually defined sections for 100% consistent OCR results
 import os
 import json
 import base64
+import io
+import hashlib
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from PIL import Image
 import requests
@@ -62,11 +66,95 @@ except (ImportError, UnicodeDecodeError) as e:
 except Exception as e:
     print(f"❌ Unexpected error loading environment: {e}")
 
+HANDWRITING_OCR_INSTRUCTIONS = """CRITICAL INSTRUCTIONS:
+1. **HANDWRITTEN TEXT FOCUS**: This section likely contains handwritten text (cursive, print, or mixed)
+2. **LOOK CAREFULLY**: Handwritten text may be light, faint, or low contrast - examine closely
+3. **EXTRACT EVERYTHING**: Include partial words, crossed-out text, and marginal notes
+4. **PRESERVE STRUCTURE**: Maintain line breaks, bullet points, and formatting
+5. **NO HALLUCINATION**: Only return text that actually exists in the image
+6. **CONTEXT CLUES**: This is from a goals/planning document - text may include goals, actions, thoughts
+
+HANDWRITING RECOGNITION TIPS:
+- Look for pen/pencil marks of any darkness level
+- Check all areas of the section, including edges
+- Consider cursive writing, print writing, and mixed styles
+- Look for faint or light handwriting
+- Include incomplete words if visible"""
+
+# PyMuPDF is not thread-safe: every call into fitz goes through this lock so
+# several documents can be OCR'd concurrently (network calls stay outside it)
+FITZ_LOCK = threading.RLock()
+
+# Page-order detection keywords (matched against lower-cased page text)
+# Page 1 indicators (circle-based content)
+PAGE1_KEYWORDS = (
+    'danger', 'eliminate', 'risk', 'threat', 'avoid', 'prevent',
+    'opportunit', 'focus', 'capture', 'chance', 'potential',
+    'strength', 'reinforce', 'maximi', 'strong', 'advantage',
+    'grateful', 'appreciate', 'blessing', 'thankful', 'main', 'primary'
+)
+
+# Page 2 indicators (grid-based content)
+PAGE2_KEYWORDS = (
+    'goal', 'objective', 'target', 'aim', 'goals',
+    'money', 'financial', 'business', 'health', 'family', 'leisure',
+    'now', 'current', 'today', 'present',
+    'todo', 'to do', 'action', 'next step', 'steps'
+)
+
+SINGLE_SECTION_OCR_PROMPT = f"""You are an expert OCR system specializing in handwritten text recognition. Analyze this cropped section from an A3 document form.
+
+TASK: Extract ALL handwritten text that appears in this image section.
+
+{HANDWRITING_OCR_INSTRUCTIONS}
+
+Return the extracted text directly, no JSON formatting needed. If absolutely no text is visible after careful examination, return "NO_TEXT_FOUND"."""
+
+# {count} is filled with the number of sections sent in the request
+BATCH_SECTIONS_OCR_PROMPT = f"""You are an expert OCR system specializing in handwritten text recognition. You will receive {{count}} cropped sections from an A3 document form, each preceded by its section number.
+
+TASK: Extract ALL handwritten text that appears in EACH image section, independently of the others.
+
+{HANDWRITING_OCR_INSTRUCTIONS}
+
+Return ONLY a JSON array of exactly {{count}} strings, one per section in the order given. Use "NO_TEXT_FOUND" for a section where absolutely no text is visible after careful examination."""
+
+PAGE1_STRUCTURE_PATTERNS = ('circle', 'main', 'primary')
+PAGE2_STRUCTURE_PATTERNS = ('row', 'column', 'grid')
+PAGE1_FIELD_PATTERNS = ('dangers to be eliminated', 'opportunities to be focused', 'strengths to be reinforced')
+PAGE2_FIELD_PATTERNS = ('health goals', 'money goals', 'family goals', 'business goals', 'leisure goals')
+
 class SectionedGPT4oOCR:
     """GPT-4o OCR with manual section definitions for consistent results."""
     
-    def __init__(self, api_key: str = None, section_config_path: str = "A3_templates/a3_section_config.json", enable_spell_check: bool = True):
-        """Initialize sectioned OCR with API key and section configuration."""
+    # Number of section crops sent together in one GPT-4o request (1 = one request per section)
+    SECTIONS_PER_REQUEST = 4
+    
+    OCR_MODEL = "gpt-4o"
+    
+    # Response token budget per section (a batched request gets this times the section count)
+    SECTION_MAX_TOKENS = 500
+    
+    # JPEG quality used for images uploaded to GPT-4o
+    JPEG_QUALITY = 85
+    
+    # Keep-alive connections held open to the API
+    HTTP_POOL_SIZE = 16
+    
+    # Section OCR results are cached on disk per user, keyed by the uploaded image and the OCR
+    # settings; A3_OCR_CACHE=0 turns the cache off and A3_OCR_CACHE_DIR moves it
+    OCR_CACHE_MAX_AGE_DAYS = 30
+    OCR_CACHE_MAX_FILES = 5000
+    
+    # Concurrent GPT-4o requests per page and retry policy for rate-limited (HTTP 429) responses
+    MAX_CONCURRENT_REQUESTS = 4
+    MAX_RATE_LIMIT_RETRIES = 4
+    
+    def __init__(self, api_key: str = None, section_config_path: str = "A3_templates/a3_section_config.json", enable_spell_check: bool = True, enable_ocr_cache: bool = None):
+        """Initialize sectioned OCR with API key and section configuration.
+        
+        enable_ocr_cache defaults to the A3_OCR_CACHE environment variable (on unless "0").
+        """
         # Specifically get OpenAI API key (not GitHub token)
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not self.api_key:
@@ -80,6 +168,27 @@ class SectionedGPT4oOCR:
             "Content-Type": "application/json"
         }
         
+        # One keep-alive session for all API calls so TLS handshakes are not repeated per
+        # request; the pool is sized for concurrent files x concurrent section requests
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        
+        # OCR result cache: in-process layer (cache key -> text) over a per-user folder
+        if enable_ocr_cache is None:
+            enable_ocr_cache = os.getenv("A3_OCR_CACHE", "1") != "0"
+        self.enable_ocr_cache = enable_ocr_cache
+        self.ocr_cache_dir = self._default_ocr_cache_dir()
+        self._ocr_memory_cache = {}
+        
+        # Cached text is only reused for the same model, prompts and token budget
+        self._ocr_cache_salt = hashlib.sha256(
+            f"{self.OCR_MODEL}:{self.SECTION_MAX_TOKENS}:{SINGLE_SECTION_OCR_PROMPT}:{BATCH_SECTIONS_OCR_PROMPT}".encode('utf-8')
+        ).hexdigest()
+        
+        if self.enable_ocr_cache:
+            self._prune_ocr_cache()
+        
         # Load section configuration
         self.section_config_path = Path(section_config_path)
         self.sections = self.load_section_config()
@@ -156,16 +265,51 @@ class SectionedGPT4oOCR:
     
     def get_pdf_page_size(self, pdf_path: Path) -> tuple:
         """Get the pixel size of first page of PDF at 2x zoom (same as processing)."""
-        pdf_doc = fitz.open(pdf_path)
-        page = pdf_doc[0]
+        with FITZ_LOCK:
+            pdf_doc = fitz.open(pdf_path)
+            page = pdf_doc[0]
+            
+            # Same 2x zoom as used in processing; the pixmap size follows from the
+            # transformed page rectangle, so there is no need to render the page
+            mat = fitz.Matrix(2.0, 2.0)
+            pixel_rect = (page.rect * mat).irect
+            
+            size = (pixel_rect.width, pixel_rect.height)
+            pdf_doc.close()
+        return size
+    
+    def pixmap_to_image(self, pix: fitz.Pixmap) -> Image.Image:
+        """Wrap a rendered PyMuPDF pixmap as a PIL Image without a PNG round-trip."""
+        mode = "RGBA" if pix.alpha else "RGB"
+        return Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    
+    def page_render_matrix(self, page: fitz.Page) -> fitz.Matrix:
+        """Matrix that renders a PDF page directly at the reference template size."""
+        if not self.reference_template_size:
+            return fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
         
-        # Same 2x zoom as used in processing
-        mat = fitz.Matrix(2.0, 2.0)
-        pix = page.get_pixmap(matrix=mat)
+        target_width, target_height = self.reference_template_size
+        return fitz.Matrix(target_width / page.rect.width, target_height / page.rect.height)
+    
+    def render_page_image(self, pdf_doc, page_num: int, matrix: fitz.Matrix = None) -> Image.Image:
+        """Rasterize one PDF page to a PIL image (reference-size matrix by default).
         
-        size = (pix.width, pix.height)
-        pdf_doc.close()
-        return size
+        The page and pixmap are created, used and released inside FITZ_LOCK; only the
+        PIL copy of the samples leaves the lock.
+        """
+        with FITZ_LOCK:
+            page = pix = None
+            try:
+                page = pdf_doc[page_num]
+                pix = page.get_pixmap(matrix=self.page_render_matrix(page) if matrix is None else matrix)
+                return self.pixmap_to_image(pix)
+            finally:
+                pix = page = None
+    
+    def page_count(self, pdf_doc) -> int:
+        """Number of pages in an open PDF, read under FITZ_LOCK."""
+        with FITZ_LOCK:
+            return len(pdf_doc)
     
     def standardize_page_size(self, image: Image.Image) -> Image.Image:
         """Standardize page image to reference template size."""
@@ -173,7 +317,7 @@ class SectionedGPT4oOCR:
             return image
         
         current_size = image.size
-        target_size = self.reference_template_size
+        target_size = tuple(self.reference_template_size)  # may be a list when read from JSON metadata
         
         if current_size == target_size:
             print(f"   📐 Image already at reference size")
@@ -181,17 +325,26 @@ class SectionedGPT4oOCR:
         
         print(f"   📐 Scaling from {current_size[0]}x{current_size[1]} to {target_size[0]}x{target_size[1]}")
         
-        # Use high-quality resizing
-        resized_image = image.resize(target_size, Image.Resampling.LANCZOS)
+        # Use high-quality resizing; for large downscales Pillow first box-reduces by an
+        # integer factor (cheap) and only runs Lanczos over the last ~2x of the reduction
+        resized_image = image.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
         return resized_image
     
-    def encode_image(self, image: Image.Image) -> str:
+    def encode_image(self, image: Image.Image, image_format: str = 'PNG', **save_options) -> str:
         """Encode PIL Image to base64 for API."""
-        import io
         buffer = io.BytesIO()
-        image.save(buffer, format='PNG')
+        image.save(buffer, format=image_format, **save_options)
         return base64.b64encode(buffer.getvalue()).decode('utf-8')
     
+    def image_data_url(self, image: Image.Image) -> str:
+        """Encode PIL Image as a data URL, using JPEG unless transparency has to be kept."""
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            return f"data:image/png;base64,{self.encode_image(image)}"
+        
+        # Scanned handwriting is several times smaller as JPEG than PNG at OCR-equivalent quality
+        rgb_image = image if image.mode == "RGB" else image.convert("RGB")
+        return f"data:image/jpeg;base64,{self.encode_image(rgb_image, 'JPEG', quality=self.JPEG_QUALITY, optimize=True)}"
+    
     def crop_section(self, image: Image.Image, rect: List[float]) -> Image.Image:
         """Crop image to specific section coordinates."""
         x1, y1, x2, y2 = rect
@@ -212,54 +365,145 @@ class SectionedGPT4oOCR:
         
         return cropped
     
-    def extract_text_from_section(self, section_image: Image.Image, section_name: str) -> Dict[str, Any]:
+    def warm_up_connection(self):
+        """Open a pooled connection to the API in the background so the first OCR request skips the handshake."""
+        def _warm_up():
+            try:
+                self.session.head("https://api.openai.com/v1/models", headers=self.headers, timeout=5)
+            except requests.RequestException:
+                pass  # Best effort only; the first real request will connect instead
+        
+        threading.Thread(target=_warm_up, daemon=True).start()
+    
+    def _post_with_retry(self, payload: Dict[str, Any], timeout: float) -> requests.Response:
+        """POST a chat completion, backing off exponentially while the API is rate limiting."""
+        delay = 1.0
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            response = self.session.post(self.api_url, headers=self.headers, json=payload, timeout=timeout)
+            if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                return response
+            
+            retry_after = response.headers.get("Retry-After")
+            wait = float(retry_after) if retry_after and retry_after.replace('.', '', 1).isdigit() else delay
+            print(f"       ⏳ Rate limited, retrying in {wait:.1f}s...")
+            time.sleep(wait)
+            delay *= 2
+    
+    @staticmethod
+    def _default_ocr_cache_dir() -> Path:
+        """Per-user OCR cache folder (A3_OCR_CACHE_DIR overrides it)."""
+        if os.getenv("A3_OCR_CACHE_DIR"):
+            return Path(os.getenv("A3_OCR_CACHE_DIR"))
+        
+        if os.name == "nt" and os.getenv("LOCALAPPDATA"):
+            base_dir = Path(os.getenv("LOCALAPPDATA"))
+        else:
+            base_dir = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+        return base_dir / "A3_Automation" / "ocr_cache"
+    
+    def _prune_ocr_cache(self):
+        """Drop cache files older than OCR_CACHE_MAX_AGE_DAYS, then the oldest beyond OCR_CACHE_MAX_FILES."""
+        try:
+            entries = [entry for entry in os.scandir(self.ocr_cache_dir) if entry.name.endswith(".json")]
+        except OSError:
+            return  # no cache yet
+        
+        cutoff = time.time() - self.OCR_CACHE_MAX_AGE_DAYS * 86400
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for index, entry in enumerate(entries):
+            if index >= self.OCR_CACHE_MAX_FILES or entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+    
+    def _cache_key(self, image_url: str) -> str:
+        """Hash identifying an encoded section image under the current OCR settings."""
+        return hashlib.sha256(f"{self._ocr_cache_salt}:{image_url}".encode('utf-8')).hexdigest()
+    
+    def _cache_get(self, cache_key: str):
+        """Return cached OCR text for a section image, or None on a cache miss."""
+        if not self.enable_ocr_cache:
+            return None
+        
+        if cache_key in self._ocr_memory_cache:
+            return self._ocr_memory_cache[cache_key]
+        
+        cache_file = self.ocr_cache_dir / f"{cache_key}.json"
+        try:
+            if cache_file.stat().st_mtime < time.time() - self.OCR_CACHE_MAX_AGE_DAYS * 86400:
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                text = json.load(f)["text"]
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        self._ocr_memory_cache[cache_key] = text
+        return text
+    
+    def _cache_put(self, cache_key: str, text: str):
+        """Store OCR text for a section image in memory and on disk (empty results are not cached)."""
+        if not self.enable_ocr_cache or not text:
+            return
+        
+        self._ocr_memory_cache[cache_key] = text
+        
+        try:
+            self.ocr_cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent readers never see a partial file
+            cache_file = self.ocr_cache_dir / f"{cache_key}.json"
+            temp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump({"text": text}, f)
+            os.replace(temp_file, cache_file)
+        except OSError as e:
+            print(f"       ⚠️ Could not write OCR cache: {e}")
+    
+    def _cached_section_result(self, section_name: str, text: str) -> Dict[str, Any]:
+        """Build an extraction result from cached OCR text."""
+        print(f"       💾 {section_name}: cached result")
+        return {
+            "success": True,
+            "text": text,
+            "processing_time": 0,
+            "confidence": "high" if text else "low",
+            "cached": True
+        }
+    
+    def extract_text_from_section(self, section_image: Image.Image, section_name: str, image_url: str = None) -> Dict[str, Any]:
         """Extract text from a single section using GPT-4o."""
         print(f"   🔍 Processing section: {section_name}")
         
         # Encode image
-        base64_image = self.encode_image(section_image)
+        image_url = image_url or self.image_data_url(section_image)
+        
+        # Identical section images are answered from the OCR cache
+        cache_key = self._cache_key(image_url)
+        cached_text = self._cache_get(cache_key)
+        if cached_text is not None:
+            return self._cached_section_result(section_name, cached_text)
         
         # Create focused prompt for single section text extraction
-        prompt = f"""You are an expert OCR system specializing in handwritten text recognition. Analyze this cropped section from an A3 document form.
-
-TASK: Extract ALL handwritten text that appears in this image section.
-
-CRITICAL INSTRUCTIONS:
-1. **HANDWRITTEN TEXT FOCUS**: This section likely contains handwritten text (cursive, print, or mixed)
-2. **LOOK CAREFULLY**: Handwritten text may be light, faint, or low contrast - examine closely
-3. **EXTRACT EVERYTHING**: Include partial words, crossed-out text, and marginal notes
-4. **PRESERVE STRUCTURE**: Maintain line breaks, bullet points, and formatting
-5. **NO HALLUCINATION**: Only return text that actually exists in the image
-6. **CONTEXT CLUES**: This is from a goals/planning document - text may include goals, actions, thoughts
-
-HANDWRITING RECOGNITION TIPS:
-- Look for pen/pencil marks of any darkness level
-- Check all areas of the section, including edges
-- Consider cursive writing, print writing, and mixed styles
-- Look for faint or light handwriting
-- Include incomplete words if visible
-
-Return the extracted text directly, no JSON formatting needed. If absolutely no text is visible after careful examination, return "NO_TEXT_FOUND"."""
-
+        prompt = SINGLE_SECTION_OCR_PROMPT
         # API payload - simple text response
         payload = {
-            "model": "gpt-4o",
+            "model": self.OCR_MODEL,
             "messages": [
                 {
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}", "detail": "high"}}
+                        {"type": "image_url", "image_url": {"url": image_url, "detail": "high"}}
                     ]
                 }
             ],
-            "max_tokens": 500,
+            "max_tokens": self.SECTION_MAX_TOKENS,
             "temperature": 0
         }
         
         try:
             start_time = time.time()
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=30)
+            response = self._post_with_retry(payload, timeout=30)
             processing_time = time.time() - start_time
             
             if response.status_code == 200:
@@ -277,6 +521,7 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
                     }
                 
                 print(f"       ✅ Extracted: '{extracted_text[:50]}{'...' if len(extracted_text) > 50 else ''}'")
+                self._cache_put(cache_key, extracted_text)
                 return {
                     "success": True,
                     "text": extracted_text,
@@ -302,6 +547,103 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
                 "processing_time": 0
             }
     
+    def extract_text_from_sections_batch(self, section_images: List[Image.Image], section_names: List[str]) -> List[Dict[str, Any]]:
+        """Extract text from several sections with a single GPT-4o request.
+        
+        Sections found in the OCR cache are not sent. Falls back to one request
+        per section if the batched response cannot be parsed.
+        """
+        image_urls = [self.image_data_url(section_image) for section_image in section_images]
+        cache_keys = [self._cache_key(image_url) for image_url in image_urls]
+        
+        results = [None] * len(section_images)
+        pending = []
+        for index, cache_key in enumerate(cache_keys):
+            cached_text = self._cache_get(cache_key)
+            if cached_text is not None:
+                results[index] = self._cached_section_result(section_names[index], cached_text)
+            else:
+                pending.append(index)
+        
+        if len(pending) == 1:
+            index = pending[0]
+            results[index] = self.extract_text_from_section(section_images[index], section_names[index], image_urls[index])
+        elif pending:
+            for index, result in zip(pending, self._request_sections_batch(
+                [section_images[i] for i in pending],
+                [section_names[i] for i in pending],
+                [image_urls[i] for i in pending],
+                [cache_keys[i] for i in pending]
+            )):
+                results[index] = result
+        
+        return results
+    
+    def _request_sections_batch(self, section_images: List[Image.Image], section_names: List[str], image_urls: List[str], cache_keys: List[str]) -> List[Dict[str, Any]]:
+        """Send several encoded sections to GPT-4o in one request."""
+        print(f"   🔍 Processing {len(section_images)} sections in one request: {', '.join(section_names)}")
+        
+        prompt = BATCH_SECTIONS_OCR_PROMPT.format(count=len(section_images))
+        
+        content = [{"type": "text", "text": prompt}]
+        for index, (section_name, image_url) in enumerate(zip(section_names, image_urls), 1):
+            content.append({"type": "text", "text": f"Section {index}: {section_name}"})
+            content.append({"type": "image_url", "image_url": {"url": image_url, "detail": "high"}})
+        
+        payload = {
+            "model": self.OCR_MODEL,
+            "messages": [{"role": "user", "content": content}],
+            "max_tokens": self.SECTION_MAX_TOKENS * len(section_images),
+            "temperature": 0
+        }
+        
+        try:
+            start_time = time.time()
+            response = self._post_with_retry(payload, timeout=30 + 15 * len(section_images))
+            processing_time = time.time() - start_time
+            
+            if response.status_code != 200:
+                raise ValueError(f"API error {response.status_code}: {response.text}")
+            
+            texts = self._parse_batch_response(response.json()['choices'][0]['message']['content'], len(section_images))
+        
+        except Exception as e:
+            print(f"       ⚠️ Batched extraction failed ({e}), falling back to one request per section")
+            return [
+                self.extract_text_from_section(img, name, url)
+                for img, name, url in zip(section_images, section_names, image_urls)
+            ]
+        
+        # Split the request time evenly so per-section timing still adds up
+        time_per_section = processing_time / len(section_images)
+        results = []
+        for section_name, cache_key, text in zip(section_names, cache_keys, texts):
+            text = text.strip()
+            if not text or text == "NO_TEXT_FOUND":
+                print(f"       ⚪ {section_name}: no text found")
+                results.append({"success": True, "text": "", "processing_time": time_per_section, "confidence": "low"})
+            else:
+                print(f"       ✅ {section_name}: '{text[:50]}{'...' if len(text) > 50 else ''}'")
+                self._cache_put(cache_key, text)
+                results.append({"success": True, "text": text, "processing_time": time_per_section, "confidence": "high"})
+        
+        return results
+    
+    def _parse_batch_response(self, content: str, expected_count: int) -> List[str]:
+        """Parse the JSON array returned for a batched section request."""
+        content = content.strip()
+        
+        # Strip markdown code fences if the model added them
+        if content.startswith("```"):
+            content = content.split("\n", 1)[1] if "\n" in content else ""
+            content = content.rsplit("```", 1)[0]
+        
+        texts = json.loads(content)
+        if not isinstance(texts, list) or len(texts) != expected_count:
+            raise ValueError(f"expected a JSON array of {expected_count} strings")
+        
+        return [text if isinstance(text, str) else "" for text in texts]
+    
     def process_page_sections(self, image: Image.Image, page_number: int) -> List[Dict[str, Any]]:
         """Process all sections for a specific page."""
         page_key = f"page_{page_number}"
@@ -313,7 +655,8 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
         page_sections = self.sections[page_key]
         print(f"📄 Processing Page {page_number}: {len(page_sections)} sections")
         
-        results = []
+        # Crop every section first so they can be sent to GPT-4o in batches
+        cropped_sections = []
         
         for section in page_sections:
             section_name = section["name"]
@@ -331,8 +674,33 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
                 print(f"       ❌ Failed to crop section")
                 continue
             
-            # Extract text from this section
-            extraction_result = self.extract_text_from_section(section_image, section_name)
+            cropped_sections.append((section, section_image))
+        
+        # Extract text, several sections per request, with the requests running concurrently
+        batch_size = max(1, self.SECTIONS_PER_REQUEST)
+        batches = [cropped_sections[start:start + batch_size] for start in range(0, len(cropped_sections), batch_size)]
+        
+        extraction_results = []
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.MAX_CONCURRENT_REQUESTS, len(batches))) as executor:
+                futures = [
+                    executor.submit(
+                        self.extract_text_from_sections_batch,
+                        [section_image for _, section_image in batch],
+                        [section["name"] for section, _ in batch]
+                    )
+                    for batch in batches
+                ]
+                # Collect in submission order so results line up with cropped_sections
+                for future in futures:
+                    extraction_results.extend(future.result())
+        
+        results = []
+        
+        for (section, _), extraction_result in zip(cropped_sections, extraction_results):
+            section_name = section["name"]
+            section_rect = section["rect"]
+            target_field = section.get("target_field", "")
             
             # Build section result
             section_result = {
@@ -374,18 +742,18 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
                 print(f"\n🔧 MANUAL OVERRIDE: Pages forced to NORMAL order")
                 return [0, 1]
         
-        if len(pdf_doc) < 2:
+        page_count = self.page_count(pdf_doc)
+        if page_count < 2:
             return [0]  # Only one page
         
         page_scores = []
         
-        for page_num in range(min(2, len(pdf_doc))):
+        for page_num in range(min(2, page_count)):
             print(f"\n📄 Analyzing Page {page_num + 1}...")
             
-            page = pdf_doc[page_num]
-            
-            # Extract text content for analysis
-            page_text = page.get_text().lower()
+            # Extract text content for analysis (the page object never leaves the lock)
+            with FITZ_LOCK:
+                page_text = pdf_doc[page_num].get_text().lower()
             text_length = len(page_text.strip())
             
             print(f"   📝 Extracted {text_length} characters")
@@ -396,12 +764,7 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
                 try:
                     # Convert page to image for OCR analysis
                     mat = fitz.Matrix(1.5, 1.5)  # Lower res for quick analysis
-                    pix = page.get_pixmap(matrix=mat)
-                    
-                    import io
-                    from PIL import Image
-                    img_data = pix.tobytes("png")
-                    page_image = Image.open(io.BytesIO(img_data))
+                    page_image = self.render_page_image(pdf_doc, page_num, mat)
                     
                     # Quick OCR on small sections to get sample text
                     width, height = page_image.size
@@ -424,55 +787,39 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
             page1_score = 0
             page2_score = 0
             
-            # Page 1 indicators (circle-based content)
-            page1_keywords = [
-                'danger', 'eliminate', 'risk', 'threat', 'avoid', 'prevent',
-                'opportunit', 'focus', 'capture', 'chance', 'potential',
-                'strength', 'reinforce', 'maximi', 'strong', 'advantage',
-                'grateful', 'appreciate', 'blessing', 'thankful', 'main', 'primary'
-            ]
-            
-            # Page 2 indicators (grid-based content)
-            page2_keywords = [
-                'goal', 'objective', 'target', 'aim', 'goals',
-                'money', 'financial', 'business', 'health', 'family', 'leisure',
-                'now', 'current', 'today', 'present',
-                'todo', 'to do', 'action', 'next step', 'steps'
-            ]
-            
             # Count keyword matches with context weighting
             matched_p1_keywords = []
-            for keyword in page1_keywords:
+            for keyword in PAGE1_KEYWORDS:
                 if keyword in page_text:
                     page1_score += 1
                     matched_p1_keywords.append(keyword)
             
             matched_p2_keywords = []
-            for keyword in page2_keywords:
+            for keyword in PAGE2_KEYWORDS:
                 if keyword in page_text:
                     page2_score += 1
                     matched_p2_keywords.append(keyword)
             
             # Look for structural patterns
-            if any(pattern in page_text for pattern in ['row', 'column', 'grid']):
+            if any(pattern in page_text for pattern in PAGE2_STRUCTURE_PATTERNS):
                 page2_score += 2
                 matched_p2_keywords.append('[structure: grid]')
             
-            if any(pattern in page_text for pattern in ['circle', 'main', 'primary']):
+            if any(pattern in page_text for pattern in PAGE1_STRUCTURE_PATTERNS):
                 page1_score += 2
                 matched_p1_keywords.append('[structure: circles]')
                 
             # Look for specific field patterns (higher weight)
-            if any(pattern in page_text for pattern in ['dangers to be eliminated', 'opportunities to be focused', 'strengths to be reinforced']):
+            if any(pattern in page_text for pattern in PAGE1_FIELD_PATTERNS):
                 page1_score += 5
                 matched_p1_keywords.append('[specific: A3 page1 fields]')
                 
-            if any(pattern in page_text for pattern in ['health goals', 'money goals', 'family goals', 'business goals', 'leisure goals']):
+            if any(pattern in page_text for pattern in PAGE2_FIELD_PATTERNS):
                 page2_score += 5
                 matched_p2_keywords.append('[specific: A3 page2 fields]')
             
             # Positional analysis - Page 2 typically has more structured/tabular content
-            line_count = len([l for l in page_text.split('\n') if l.strip()])
+            line_count = sum(1 for l in page_text.splitlines() if l.strip())
             if line_count > 20:  # Lots of lines suggests grid structure
                 page2_score += 1
                 matched_p2_keywords.append('[layout: many lines]')
@@ -539,17 +886,10 @@ Return the extracted text directly, no JSON formatting needed. If absolutely no
         # Convert pages to images for visual analysis
         layout_scores = []
         
-        for page_num in range(min(2, len(pdf_doc))):
-            page = pdf_doc[page_num]
-            
+        for page_num in range(min(2, self.page_count(pdf_doc))):
             # Convert to image
             mat = fitz.Matrix(1.0, 1.0)  # Normal resolution
-            pix = page.get_pixmap(matrix=mat)
-            
-            import io
-            from PIL import Image
-            img_data = pix.tobytes("png")
-            page_image = Image.open(io.BytesIO(img_data))
+            page_image = self.render_page_image(pdf_doc, page_num, mat)
             
             # Use GPT-4o to analyze layout characteristics
             layout_prompt = """Analyze this page layout and determine if it looks more like:
@@ -588,7 +928,7 @@ Respond with just 'A' or 'B' and a brief reason."""
     
     def _quick_text_extraction(self, image: Image.Image) -> Dict[str, Any]:
         """Quick text extraction for page classification"""
-        base64_image = self.encode_image(image)
+        image_url = self.image_data_url(image)
         
         prompt = "Extract any visible text from this image section. Just return the text, no formatting."
         
@@ -599,7 +939,7 @@ Respond with just 'A' or 'B' and a brief reason."""
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}", "detail": "low"}}
+                        {"type": "image_url", "image_url": {"url": image_url, "detail": "low"}}
                     ]
                 }
             ],
@@ -608,7 +948,7 @@ Respond with just 'A' or 'B' and a brief reason."""
         }
         
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=15)
+            response = self._post_with_retry(payload, timeout=15)
             if response.status_code == 200:
                 result = response.json()
                 text = result['choices'][0]['message']['content'].strip()
@@ -620,7 +960,7 @@ Respond with just 'A' or 'B' and a brief reason."""
     
     def _layout_analysis(self, image: Image.Image, prompt: str) -> Dict[str, Any]:
         """Visual layout analysis for page classification"""
-        base64_image = self.encode_image(image)
+        image_url = self.image_data_url(image)
         
         payload = {
             "model": "gpt-4o",
@@ -629,7 +969,7 @@ Respond with just 'A' or 'B' and a brief reason."""
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
-                        {"type": "image_url", "image_url": {"url": f"data:image/png;base64,{base64_image}", "detail": "low"}}
+                        {"type": "image_url", "image_url": {"url": image_url, "detail": "low"}}
                     ]
                 }
             ],
@@ -638,7 +978,7 @@ Respond with just 'A' or 'B' and a brief reason."""
         }
         
         try:
-            response = requests.post(self.api_url, headers=self.headers, json=payload, timeout=15)
+            response = self._post_with_retry(payload, timeout=15)
             if response.status_code == 200:
                 result = response.json()
                 text = result['choices'][0]['message']['content'].strip()
@@ -668,53 +1008,59 @@ Respond with just 'A' or 'B' and a brief reason."""
                 # Process PDF
                 print("📄 Processing PDF document...")
                 
-                pdf_doc = fitz.open(document_path)
-                
-                # Detect correct page order based on content
-                correct_order = self.detect_and_reorder_pages(pdf_doc, manual_page_order)
-                print(f"\n📋 Processing pages in order: {[f'Page {i+1}' for i in correct_order]}")
+                with FITZ_LOCK:
+                    pdf_doc = fitz.open(document_path)
+                    page_count = len(pdf_doc)
                 
-                for logical_page_num, physical_page_num in enumerate(correct_order):
-                    if physical_page_num >= len(pdf_doc):
-                        continue
-                        
-                    page = pdf_doc[physical_page_num]
-                    
-                    # Convert page to high-resolution image
-                    mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
-                    pix = page.get_pixmap(matrix=mat)
-                    
-                    # Convert to PIL Image
-                    import io
-                    img_data = pix.tobytes("png")
-                    page_image = Image.open(io.BytesIO(img_data))
-                    
-                    print(f"\n📄 Processing Logical Page {logical_page_num + 1} (Physical Page {physical_page_num + 1})")
-                    print(f"   📐 Original image size: {page_image.width}x{page_image.height}")
-                    
-                    # Standardize page size to match reference template
-                    page_image = self.standardize_page_size(page_image)
-                    print(f"   📐 Standardized image size: {page_image.width}x{page_image.height}")
-                    
-                    # Process sections for this page (use logical page number for sectioning)
-                    page_results = self.process_page_sections(page_image, logical_page_num + 1)
+                try:
+                    # Detect correct page order based on content
+                    correct_order = self.detect_and_reorder_pages(pdf_doc, manual_page_order)
+                    print(f"\n📋 Processing pages in order: {[f'Page {i+1}' for i in correct_order]}")
                     
-                    # Add page info to results
-                    for result in page_results:
-                        result["page_number"] = logical_page_num + 1  # Use logical page number
-                        result["physical_page"] = physical_page_num + 1  # Track physical page too
-                        result["file_name"] = document_path.name
-                        result["file_type"] = "PDF"
+                    for logical_page_num, physical_page_num in enumerate(correct_order):
+                        if physical_page_num >= page_count:
+                            continue
+                        
+                        # Rasterize straight at the reference template size so no PIL resample is needed,
+                        # converting straight from the raw samples (no PNG encode/decode)
+                        page_image = self.render_page_image(pdf_doc, physical_page_num)
+                        
+                        print(f"\n📄 Processing Logical Page {logical_page_num + 1} (Physical Page {physical_page_num + 1})")
+                        print(f"   📐 Original image size: {page_image.width}x{page_image.height}")
+                        
+                        # Standardize page size to match reference template
+                        page_image = self.standardize_page_size(page_image)
+                        print(f"   📐 Standardized image size: {page_image.width}x{page_image.height}")
+                        
+                        # Process sections for this page (use logical page number for sectioning)
+                        page_results = self.process_page_sections(page_image, logical_page_num + 1)
+                        
+                        # Add page info to results
+                        for result in page_results:
+                            result["page_number"] = logical_page_num + 1  # Use logical page number
+                            result["physical_page"] = physical_page_num + 1  # Track physical page too
+                            result["file_name"] = document_path.name
+                            result["file_type"] = "PDF"
+                        
+                        all_results.extend(page_results)
+                        
+                        # Only one page bitmap is alive at a time
+                        page_image.close()
                     
-                    all_results.extend(page_results)
-                
-                pdf_doc.close()
+                finally:
+                    # Close under the lock, also when a page fails (never left to the garbage collector)
+                    with FITZ_LOCK:
+                        pdf_doc.close()
             
             else:
                 # Process image
                 print("🖼️ Processing image document...")
                 
                 with Image.open(document_path) as img:
+                    # Let JPEG scans decode at a reduced scale that still covers the reference size
+                    if self.reference_template_size:
+                        img.draft("RGB", tuple(self.reference_template_size))
+                    
                     if img.mode != "RGB":
                         img = img.convert("RGB")
                     
@@ -738,14 +1084,14 @@ Respond with just 'A' or 'B' and a brief reason."""
             total_processing_time = time.time() - total_start_time
             
             # Summary
-            successful_sections = [r for r in all_results if r["success"]]
-            sections_with_text = [r for r in successful_sections if r["text"].strip()]
+            successful_sections = sum(1 for r in all_results if r["success"])
+            sections_with_text = sum(1 for r in all_results if r["success"] and r["text"].strip())
             
             print(f"\n🎉 SECTIONED OCR COMPLETE")
             print("="*50)
             print(f"📊 Total sections processed: {len(all_results)}")
-            print(f"✅ Successful extractions: {len(successful_sections)}")
-            print(f"📝 Sections with text: {len(sections_with_text)}")
+            print(f"✅ Successful extractions: {successful_sections}")
+            print(f"📝 Sections with text: {sections_with_text}")
             print(f"⏱️ Total processing time: {total_processing_time:.2f}s")
             
             # Apply spell check if enabled
@@ -768,20 +1114,22 @@ Respond with just 'A' or 'B' and a brief reason."""
                     # Apply spell check
                     corrected_results = spell_check_sections(sectioned_results)
                     
+                    # Index corrected sections once instead of rescanning the page for every result
+                    corrected_lookup = {}
+                    for page_key, corrected_sections in corrected_results.items():
+                        for corrected_section in corrected_sections:
+                            # First match wins, as with the previous linear search
+                            corrected_lookup.setdefault((page_key, corrected_section["name"]), corrected_section)
+                    
                     # Convert back to original format
                     corrected_count = 0
-                    for i, result in enumerate(all_results):
-                        page_num = result["page_number"]
-                        page_key = f"page_{page_num}"
-                        if page_key in corrected_results:
-                            # Find matching corrected section
-                            for corrected_section in corrected_results[page_key]:
-                                if corrected_section["name"] == result["section_name"]:
-                                    if "spell_corrections" in corrected_section:
-                                        corrected_count += len(corrected_section["spell_corrections"])
-                                        result["spell_corrections"] = corrected_section["spell_corrections"]
-                                    result["text"] = corrected_section["text"]
-                                    break
+                    for result in all_results:
+                        corrected_section = corrected_lookup.get((f"page_{result['page_number']}", result["section_name"]))
+                        if corrected_section is not None:
+                            if "spell_corrections" in corrected_section:
+                                corrected_count += len(corrected_section["spell_corrections"])
+                                result["spell_corrections"] = corrected_section["spell_corrections"]
+                            result["text"] = corrected_section["text"]
                     
                     if corrected_count > 0:
                         print(f"✅ Spell check applied: {corrected_count} corrections made")
@@ -795,8 +1143,8 @@ Respond with just 'A' or 'B' and a brief reason."""
                 "success": True,
                 "file_name": document_path.name,
                 "total_sections": len(all_results),
-                "successful_sections": len(successful_sections),
-                "sections_with_text": len(sections_with_text),
+                "successful_sections": successful_sections,
+                "sections_with_text": sections_with_text,
                 "total_processing_time": total_processing_time,
                 "spell_check_enabled": self.enable_spell_check,
                 "results": final_results
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test parsing of batched GPT-4o section responses
+Canned API responses check that a bad batch falls back to per-section requests
+instead of assigning text to the wrong sections
+"""
+
+import json
+
+from PIL import Image
+
+from sectioned_gpt4o_ocr import SectionedGPT4oOCR
+
+class CannedResponse:
+    """Minimal stand-in for a requests.Response from the chat completions API."""
+    
+    def __init__(self, content: str):
+        self.status_code = 200
+        self.headers = {}
+        self.text = content
+        self._content = content
+    
+    def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+class CannedSession:
+    """Answers batched requests with batch_content and single-section requests with 'single N'."""
+    
+    def __init__(self, batch_content: str):
+        self.batch_content = batch_content
+        self.batch_requests = 0
+        self.single_requests = 0
+    
+    def post(self, url, headers=None, json=None, timeout=None):
+        images = [part for part in json["messages"][0]["content"] if part["type"] == "image_url"]
+        if len(images) > 1:
+            self.batch_requests += 1
+            return CannedResponse(self.batch_content)
+        
+        self.single_requests += 1
+        return CannedResponse(f"single {self.single_requests}")
+
+def run_batch(batch_content: str, section_count: int = 3):
+    """Send section_count distinct section images through the batched path with a canned reply."""
+    ocr = SectionedGPT4oOCR(api_key="test-key", enable_ocr_cache=False)
+    ocr.session = CannedSession(batch_content)
+    
+    images = [Image.new("RGB", (40, 40), (index * 60, 0, 0)) for index in range(section_count)]
+    names = [f"Section_1_{index + 1}" for index in range(section_count)]
+    return ocr, ocr.extract_text_from_sections_batch(images, names)
+
+def test_parse_plain_and_fenced_arrays():
+    """A bare JSON array and one wrapped in a markdown code fence parse the same way."""
+    print("🧪 Testing batch response parsing...")
+    ocr = SectionedGPT4oOCR(api_key="test-key", enable_ocr_cache=False)
+    
+    expected = ["first", "NO_TEXT_FOUND", "third"]
+    assert ocr._parse_batch_response(json.dumps(expected), 3) == expected
+    assert ocr._parse_batch_response(f"```json\n{json.dumps(expected)}\n```", 3) == expected
+    assert ocr._parse_batch_response(f"```\n{json.dumps(expected)}\n```", 3) == expected
+    
+    # Non-string entries count as empty sections rather than shifting the others
+    assert ocr._parse_batch_response('["a", null, 3]', 3) == ["a", "", ""]
+
+def test_parse_rejects_malformed_and_wrong_length():
+    """Malformed JSON, a short or long array and a non-array are rejected."""
+    print("🧪 Testing rejected batch responses...")
+    ocr = SectionedGPT4oOCR(api_key="test-key", enable_ocr_cache=False)
+    
+    for content in ['["a", "b"', "Section 1: a\nSection 2: b", '["a", "b"]', '["a", "b", "c", "d"]', '{"text": "a"}']:
+        try:
+            ocr._parse_batch_response(content, 3)
+        except ValueError:
+            continue
+        raise AssertionError(f"batch response should have been rejected: {content!r}")
+
+def test_good_batch_assigns_text_in_order():
+    """A well-formed (fenced) batch is used as-is, one entry per section in order."""
+    print("🧪 Testing a good batch...")
+    ocr, results = run_batch('```json\n["one", "NO_TEXT_FOUND", "three"]\n```')
+    
+    assert ocr.session.batch_requests == 1 and ocr.session.single_requests == 0
+    assert [result["text"] for result in results] == ["one", "", "three"]
+    assert all(result["success"] for result in results)
+
+def test_bad_batches_fall_back_to_single_requests():
+    """Malformed and short batch responses are discarded and every section is asked on its own."""
+    print("🧪 Testing batch fallbacks...")
+    for batch_content in ['["one", "two"', '["one", "two"]', "one\ntwo\nthree"]:
+        ocr, results = run_batch(batch_content)
+        
+        assert ocr.session.batch_requests == 1
+        assert ocr.session.single_requests == 3
+        assert [result["text"] for result in results] == ["single 1", "single 2", "single 3"]
+
+def main():
+    """Run all batch response tests."""
+    print("🚀 Batch OCR Response Tests")
+    print("=" * 50)
+    
+    test_parse_plain_and_fenced_arrays()
+    test_parse_rejects_malformed_and_wrong_length()
+    test_good_batch_assigns_text_in_order()
+    test_bad_batches_fall_back_to_single_requests()
+    print("✅ All batch response tests passed")
+
+if __name__ == "__main__":
+    main()
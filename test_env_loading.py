@@ -39,4 +39,27 @@ except Exception as e:
 print('\n💡 Next Steps:')
 print('   1. Edit .env file and add your actual API keys')
 print('   2. OpenAI API key: Get from https://platform.openai.com/api-keys')
-print('   3. GitHub token: Get from https://github.com/settings/tokens')
\ No newline at end of file
+print('   3. GitHub token: Get from https://github.com/settings/tokens')
+
+# .env fallback parser (used when python-dotenv is not installed)
+
+def test_env_empty_value_keeps_next_key():
+    """An empty value must not swallow the following line."""
+    from a3_sectioned_automation import parse_env_text
+    
+    assert parse_env_text("KEY=\nB=2\n") == [("KEY", ""), ("B", "2")]
+    assert parse_env_text("EMPTY=\n\nOPENAI_API_KEY=sk-1\n") == [("EMPTY", ""), ("OPENAI_API_KEY", "sk-1")]
+
+def test_env_quoted_values():
+    """Matching quotes are stripped, mismatched quotes are kept."""
+    from a3_sectioned_automation import parse_env_text
+    
+    text = 'A="x y"\nB=\'single\'\nC="unterminated\'\nD=""\n'
+    assert parse_env_text(text) == [("A", "x y"), ("B", "single"), ("C", "\"unterminated'"), ("D", "")]
+
+def test_env_blank_lines_and_comments():
+    """Blank lines, comments and surrounding spaces are ignored."""
+    from a3_sectioned_automation import parse_env_text
+    
+    text = "\n# OPENAI_API_KEY=commented\n\n  OPENAI_API_KEY = sk-2  \n\n\nGITHUB_TOKEN=gh\n"
+    assert parse_env_text(text) == [("OPENAI_API_KEY", "sk-2"), ("GITHUB_TOKEN", "gh")]
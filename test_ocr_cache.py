@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test the OCR result cache
+Checks the opt-out, key scoping, empty-result handling and pruning of the on-disk cache
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from sectioned_gpt4o_ocr import SectionedGPT4oOCR
+
+IMAGE_URL = "data:image/jpeg;base64,AAAA"
+
+def make_ocr(cache_dir: Path, enabled: bool = True, ocr_class=SectionedGPT4oOCR) -> SectionedGPT4oOCR:
+    """OCR instance whose cache lives in cache_dir (no API calls are made)."""
+    ocr = ocr_class(api_key="test-key", enable_ocr_cache=False)
+    ocr.ocr_cache_dir = cache_dir
+    ocr.enable_ocr_cache = enabled
+    return ocr
+
+def test_disabled_cache_skips_reads_and_writes():
+    """With the cache off nothing is read from or written to disk or memory."""
+    print("🧪 Testing disabled OCR cache...")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = Path(temp_dir)
+        
+        # Seed an entry through an enabled instance, then read it through a disabled one
+        enabled_ocr = make_ocr(cache_dir)
+        cache_key = enabled_ocr._cache_key(IMAGE_URL)
+        enabled_ocr._cache_put(cache_key, "seeded text")
+        assert enabled_ocr._cache_get(cache_key) == "seeded text"
+        
+        disabled_ocr = make_ocr(cache_dir, enabled=False)
+        assert disabled_ocr._cache_get(cache_key) is None
+        
+        disabled_ocr._cache_put(disabled_ocr._cache_key(IMAGE_URL + "B"), "new text")
+        assert sorted(os.listdir(cache_dir)) == [f"{cache_key}.json"]
+        assert disabled_ocr._ocr_memory_cache == {}
+
+def test_empty_results_are_not_cached():
+    """An empty OCR result is asked again next time instead of being served from the cache."""
+    print("🧪 Testing empty OCR results...")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ocr = make_ocr(Path(temp_dir))
+        cache_key = ocr._cache_key(IMAGE_URL)
+        ocr._cache_put(cache_key, "")
+        
+        assert ocr._cache_get(cache_key) is None
+        assert os.listdir(temp_dir) == []
+
+def test_cache_key_depends_on_ocr_settings():
+    """Changing the token budget (part of the OCR settings) changes the cache key."""
+    print("🧪 Testing cache key scoping...")
+    
+    class LargerBudgetOCR(SectionedGPT4oOCR):
+        SECTION_MAX_TOKENS = SectionedGPT4oOCR.SECTION_MAX_TOKENS + 100
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ocr = make_ocr(Path(temp_dir))
+        other_ocr = make_ocr(Path(temp_dir), ocr_class=LargerBudgetOCR)
+        
+        assert ocr._cache_key(IMAGE_URL) == make_ocr(Path(temp_dir))._cache_key(IMAGE_URL)
+        assert ocr._cache_key(IMAGE_URL) != other_ocr._cache_key(IMAGE_URL)
+
+def test_prune_respects_file_cap_and_age():
+    """Pruning drops expired entries, then the oldest beyond OCR_CACHE_MAX_FILES."""
+    print("🧪 Testing OCR cache pruning...")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache_dir = Path(temp_dir)
+        ocr = make_ocr(cache_dir)
+        ocr.OCR_CACHE_MAX_FILES = 2
+        
+        now = time.time()
+        ages_in_days = {"expired": ocr.OCR_CACHE_MAX_AGE_DAYS + 1, "oldest": 3, "older": 2, "newer": 1, "newest": 0}
+        for name, age_in_days in ages_in_days.items():
+            cache_file = cache_dir / f"{name}.json"
+            cache_file.write_text('{"text": "x"}', encoding="utf-8")
+            timestamp = now - age_in_days * 86400
+            os.utime(cache_file, (timestamp, timestamp))
+        
+        ocr._prune_ocr_cache()
+        assert sorted(os.listdir(cache_dir)) == ["newer.json", "newest.json"]
+
+def main():
+    """Run all OCR cache tests."""
+    print("🚀 OCR Cache Tests")
+    print("=" * 50)
+    
+    test_disabled_cache_skips_reads_and_writes()
+    test_empty_results_are_not_cached()
+    test_cache_key_depends_on_ocr_settings()
+    test_prune_respects_file_cap_and_age()
+    print("✅ All OCR cache tests passed")
+
+if __name__ == "__main__":
+    main()